@@ -1,8 +1,28 @@
 """Geocoding strategies for different providers."""
 
+from typing import Any
+
 from .cache import GeocodingCache
-from .google_maps import GoogleMapsStrategy
+from .geocoder import Geocoder
 from .nominatim import NominatimStrategy
+from .runner import RateLimitedGeocoder, TokenBucket
 from .strategy import GeocodingStrategy
 
-__all__ = ["GeocodingStrategy", "NominatimStrategy", "GoogleMapsStrategy", "GeocodingCache"]
+__all__ = [
+    "GeocodingStrategy",
+    "NominatimStrategy",
+    "GoogleMapsStrategy",
+    "GeocodingCache",
+    "Geocoder",
+    "RateLimitedGeocoder",
+    "TokenBucket",
+]
+
+
+def __getattr__(name: str) -> Any:
+    # GoogleMapsStrategy is still a stub; only import it when actually requested
+    if name == "GoogleMapsStrategy":
+        from .google_maps import GoogleMapsStrategy
+
+        return GoogleMapsStrategy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,9 +7,89 @@ allowing multiple workers and UI components to share cached data.
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import queue
+import re
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# Connection-level tuning applied on every connect(). WAL lets the UI read
+# while the geocode worker writes and replaces the rollback journal with a
+# single append; NORMAL sync is durable enough for a rebuildable cache.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    # Serve reads from a memory map (up to 256 MB) instead of read() syscalls
+    "PRAGMA mmap_size=268435456",
+)
+
+# Subset applied to read-only pool connections (the rest would need write access)
+_READER_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Read-only connections kept in the reader pool
+_READERS = 4
+
+# Matches the "ST 12345" component of a normalized address ("..., city, ST 12345, USA"),
+# or the bare "ST " left by normalize_address() when the row has no zip
+_STATE_RE = re.compile(r"(?:^|, )([A-Za-z]{2}) (?:\d|, USA$)")
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER (999 on older builds) for IN-clause batches
+_MAX_IN_PARAMS = 900
+
+
+# Hot-path statements kept as constants so every call binds parameters to the
+# same SQL text and hits the connection's prepared-statement cache.
+# Keyed directly by the text address (WITHOUT ROWID): one B-tree per write and
+# lookup instead of a rowid table plus a separate unique index.
+_SQL_CREATE_TABLE = """
+    CREATE TABLE addresses (
+      normalized_address TEXT PRIMARY KEY,
+      latitude REAL,
+      longitude REAL,
+      display_name TEXT,
+      source TEXT,
+      updated_at INTEGER,
+      state_code TEXT
+    ) WITHOUT ROWID
+"""
+_SQL_GET = (
+    "SELECT latitude, longitude, display_name, source, updated_at "
+    "FROM addresses WHERE normalized_address = ?"
+)
+_SQL_GET_MANY = (
+    "SELECT normalized_address, latitude, longitude, display_name, source, updated_at "
+    "FROM addresses WHERE normalized_address IN ({placeholders})"
+)
+_SQL_PUT = (
+    "INSERT OR REPLACE INTO addresses "
+    "(normalized_address, latitude, longitude, display_name, source, updated_at, state_code) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_DELETE = "DELETE FROM addresses WHERE normalized_address = ?"
+_SQL_DELETE_STATE = "DELETE FROM addresses WHERE state_code = ?"
+_SQL_STATS = (
+    "SELECT COUNT(*), COALESCE(SUM(CASE WHEN latitude IS NOT NULL "
+    "AND longitude IS NOT NULL THEN 1 ELSE 0 END), 0) FROM addresses"
+)
+_SQL_STATS_STATE = _SQL_STATS + " WHERE state_code = ?"
+
+# Prepared statements retained per connection (sqlite3 default is 128)
+_CACHED_STATEMENTS = 256
+
+# Upper bound on hot addresses kept in memory in front of SQLite
+_MEM_MAX = 4096
 
 
 class GeocodingCache:
@@ -20,8 +100,15 @@ class GeocodingCache:
     including latitude, longitude, display name, source provider, and
     timestamp. This prevents redundant API calls and improves performance.
 
-    Thread-safe: Each operation opens its own connection, making it safe
-    for use across multiple threads/workers.
+    Thread-safe: All writes go through a single read/write connection
+    guarded by a lock, while lookups borrow one of a small pool of
+    read-only connections. Under WAL the readers never wait on the
+    writer, so the UI can query while a geocode worker stores results.
+
+    The in-memory LRU in front of get() belongs to this instance and only
+    sees its own writes. Another instance (or process) writing the same
+    file is not reflected until the entry is evicted or this instance
+    stores, clears or closes; share one instance where that matters.
 
     Attributes:
         cache_dir: Directory where the cache database is stored.
@@ -41,6 +128,26 @@ class GeocodingCache:
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # One writer shared under a lock, plus a lazily filled pool of readers
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.RLock()
+        self._reader_pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        # Set by close(); pooled lookups and writes refuse to reconnect afterwards
+        self._closed = False
+
+        # Set after the first connect() has created the schema in the file
+        self._schema_initialized = False
+        self._schema_lock = threading.Lock()
+
+        # In-process LRU of recent get() hits; the lock only guards dict mutation.
+        # _mem_gen is bumped by every _forget() so a get() that read SQLite
+        # before a concurrent write committed does not re-insert the old row.
+        self._mem: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._mem_lock = threading.Lock()
+        self._mem_gen = 0
+
     def get_cache_path(self) -> Path:
         """
         Get the full path to the cache database file.
@@ -54,69 +161,298 @@ class GeocodingCache:
         """
         Open a connection to the cache database and ensure schema exists.
 
-        Creates the addresses table and index if they don't exist.
+        Applies the connection PRAGMAs and, on the first call for this
+        cache instance, WAL journaling and the schema (see _ensure_schema).
+
+        The connection is opened with ``check_same_thread=False`` so that
+        close() may release it from whichever thread shuts the cache down.
 
         Returns:
             SQLite connection object.
         """
         db_path = self.get_cache_path()
-        conn = sqlite3.connect(str(db_path))
-        cur = conn.cursor()
-
-        # Create table if it doesn't exist
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS addresses (
-              id INTEGER PRIMARY KEY,
-              normalized_address TEXT UNIQUE,
-              latitude REAL,
-              longitude REAL,
-              display_name TEXT,
-              source TEXT,
-              updated_at TEXT
-            )
-            """
+        conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, cached_statements=_CACHED_STATEMENTS
         )
 
-        # Create index for fast lookups
-        cur.execute(
-            "CREATE UNIQUE INDEX IF NOT EXISTS idx_addresses_norm ON addresses(normalized_address)"
-        )
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        """
+        Create and migrate the schema once per cache instance.
+
+        Page size, journal mode, tables and indexes all persist in the
+        database file, so later connections skip the DDL entirely. clear()
+        resets the flag because it deletes the file.
+
+        Args:
+            conn: Freshly opened read/write connection.
+        """
+        with self._schema_lock:
+            if self._schema_initialized:
+                return
+
+            # Only takes effect on a brand-new file; must precede WAL and schema creation
+            conn.execute("PRAGMA page_size=4096")
+            # journal_mode is persisted in the database file, so only switch once
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            if str(mode).lower() != "wal":
+                conn.execute("PRAGMA journal_mode=WAL")
+
+            self._create_schema(conn.cursor())
+            conn.commit()
+            self._schema_initialized = True
+
+    def _create_schema(self, cur: sqlite3.Cursor) -> None:
+        """
+        Create the addresses table and indexes, migrating older layouts.
+
+        Args:
+            cur: Cursor on a read/write connection.
+        """
+        columns = {row[1]: row[2] for row in cur.execute("PRAGMA table_info(addresses)")}
+        if not columns:
+            cur.execute(_SQL_CREATE_TABLE)
+        elif "id" in columns or columns.get("updated_at", "").upper() != "INTEGER":
+            # Caches with a rowid table (and, older still, text timestamps): rebuild
+            # once, since SQLite cannot change a table's key or column types in place
+            if columns.get("updated_at", "").upper() == "INTEGER":
+                updated_at = "updated_at"
+            else:
+                updated_at = "CAST(strftime('%s', updated_at) AS INTEGER)"
+            cur.execute("BEGIN")
+            cur.execute("ALTER TABLE addresses RENAME TO addresses_legacy")
+            cur.execute(_SQL_CREATE_TABLE)
+            rows = cur.execute(
+                "SELECT normalized_address, latitude, longitude, display_name, source, "
+                f"{updated_at} FROM addresses_legacy WHERE normalized_address IS NOT NULL"
+            ).fetchall()
+            cur.executemany(
+                "INSERT OR REPLACE INTO addresses (normalized_address, latitude, longitude, "
+                "display_name, source, updated_at, state_code) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*row, self.state_code_of(row[0])) for row in rows],
+            )
+            # Also drops the old idx_addresses_norm; the primary key replaces it
+            cur.execute("DROP TABLE addresses_legacy")
+
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_addresses_state ON addresses(state_code)")
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """
+        Return the shared read/write connection, opening it on first use.
+
+        The writer runs in autocommit mode; callers must hold _writer_lock
+        and open explicit transactions for multi-statement writes.
+
+        Returns:
+            SQLite connection used for every write.
 
-        conn.commit()
+        Raises:
+            sqlite3.ProgrammingError: If the cache has been closed.
+        """
+        with self._writer_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed cache.")
+            if self._writer is None:
+                conn = self.connect()
+                conn.isolation_level = None
+                self._writer = conn
+            return self._writer
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """
+        Open a read-only connection to the cache database.
+
+        Returns:
+            SQLite connection that rejects writes.
+        """
+        # The writer creates the file and schema that readers rely on
+        self._get_writer()
+        uri = self.get_cache_path().resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(
+            uri, uri=True, check_same_thread=False, cached_statements=_CACHED_STATEMENTS
+        )
+        for pragma in _READER_PRAGMAS:
+            conn.execute(pragma)
         return conn
 
+    @contextlib.contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection from the pool for the block's duration.
+
+        Connections are opened on demand up to _READERS; further callers
+        wait for one to be returned. A connection still borrowed when the
+        pool is closed is closed on return instead of being pooled again.
+
+        Yields:
+            Read-only SQLite connection.
+
+        Raises:
+            sqlite3.ProgrammingError: If the cache has been closed.
+        """
+        conn: Optional[sqlite3.Connection] = None
+        while conn is None:
+            with self._readers_lock:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Cannot operate on a closed cache.")
+                pool = self._reader_pool
+                if pool.empty() and len(self._readers) < _READERS:
+                    conn = self._open_reader()
+                    self._readers.append(conn)
+                    break
+            try:
+                # Short timeout so a waiter notices close() swapping the pool
+                conn = pool.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        try:
+            yield conn
+        finally:
+            with self._readers_lock:
+                pooled = any(c is conn for c in self._readers)
+                if pooled:
+                    self._reader_pool.put(conn)
+            if not pooled:
+                conn.close()
+
+    def _forget(self, normalized_addresses: Optional[Iterable[str]]) -> None:
+        """
+        Drop addresses from the in-memory LRU.
+
+        Writers call this after their change is committed, so any get()
+        still holding a row read before the commit sees the generation move
+        and discards it.
+
+        Args:
+            normalized_addresses: Addresses to evict, or None to empty the LRU.
+        """
+        with self._mem_lock:
+            self._mem_gen += 1
+            if normalized_addresses is None:
+                self._mem.clear()
+            else:
+                for addr in normalized_addresses:
+                    self._mem.pop(addr, None)
+
+    def close(self) -> None:
+        """
+        Close the writer and every pooled reader opened by this cache instance.
+
+        Readers still borrowed by other threads are closed as they are
+        returned. Later lookups and writes raise sqlite3.ProgrammingError.
+        """
+        with self._readers_lock:
+            self._closed = True
+        self._disconnect()
+        self._forget(None)
+
+    def _disconnect(self) -> None:
+        """Close the writer and idle readers; the next call reconnects unless closed."""
+        with self._readers_lock:
+            pool, self._reader_pool = self._reader_pool, queue.Queue()
+            self._readers = []
+        # Borrowed readers are no longer listed, so _reader() closes them on return
+        readers = []
+        while True:
+            try:
+                readers.append(pool.get_nowait())
+            except queue.Empty:
+                break
+        for conn in readers:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                try:
+                    # Refresh planner statistics for the aggregate/stat queries
+                    writer.execute("PRAGMA optimize")
+                    writer.close()
+                except sqlite3.Error:
+                    pass
+
     def get(self, normalized_address: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a cached geocoding result.
 
+        Recently returned addresses are served from an in-memory LRU without
+        querying SQLite.
+
         Args:
             normalized_address: The normalized address string to lookup.
 
         Returns:
             Dictionary with keys: lat, lon, display_name, source, updated_at
+            (unix seconds).
             Returns None if address is not in cache.
         """
-        conn = self.connect()
-        try:
+        with self._mem_lock:
+            hit = self._mem.get(normalized_address)
+            if hit is not None:
+                self._mem.move_to_end(normalized_address)
+                return dict(hit)
+            gen = self._mem_gen
+
+        with self._reader() as conn:
+            row = conn.execute(_SQL_GET, (normalized_address,)).fetchone()
+
+        if row:
+            result = {
+                "lat": row[0],
+                "lon": row[1],
+                "display_name": row[2],
+                "source": row[3],
+                "updated_at": row[4],
+            }
+            with self._mem_lock:
+                # Skip caching if a write landed since the read began
+                if gen == self._mem_gen:
+                    self._mem[normalized_address] = result
+                    if len(self._mem) > _MEM_MAX:
+                        self._mem.popitem(last=False)
+            return dict(result)
+        return None
+
+    def get_many(self, normalized_addresses: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve cached geocoding results for many addresses at once.
+
+        Lookups are issued as IN-clause queries in chunks that stay below
+        SQLite's bound-parameter limit.
+
+        Args:
+            normalized_addresses: Normalized address strings to lookup.
+
+        Returns:
+            Dictionary mapping each cached address to a result dictionary
+            shaped like get(). Addresses not in cache are omitted.
+        """
+        addresses = list(dict.fromkeys(normalized_addresses))
+        results: Dict[str, Dict[str, Any]] = {}
+        if not addresses:
+            return results
+
+        with self._reader() as conn:
             cur = conn.cursor()
-            cur.execute(
-                "SELECT latitude, longitude, display_name, source, updated_at FROM addresses WHERE normalized_address = ?",
-                (normalized_address,),
-            )
-            row = cur.fetchone()
-
-            if row:
-                return {
-                    "lat": row[0],
-                    "lon": row[1],
-                    "display_name": row[2],
-                    "source": row[3],
-                    "updated_at": row[4],
-                }
-            return None
-        finally:
-            conn.close()
+            for start in range(0, len(addresses), _MAX_IN_PARAMS):
+                chunk = addresses[start : start + _MAX_IN_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                cur.execute(_SQL_GET_MANY.format(placeholders=placeholders), chunk)
+                for row in cur.fetchall():
+                    results[row[0]] = {
+                        "lat": row[1],
+                        "lon": row[2],
+                        "display_name": row[3],
+                        "source": row[4],
+                        "updated_at": row[5],
+                    }
+        return results
 
     def put(
         self,
@@ -138,16 +474,37 @@ class GeocodingCache:
             display_name: Human-readable address or error message.
             source: Name of the geocoding provider (e.g., "nominatim", "none").
         """
-        conn = self.connect()
-        try:
-            cur = conn.cursor()
-            cur.execute(
-                "INSERT OR REPLACE INTO addresses (normalized_address, latitude, longitude, display_name, source, updated_at) VALUES (?, ?, ?, ?, ?, datetime('now'))",
-                (normalized_address, lat, lon, display_name, source),
-            )
+        self.put_many([(normalized_address, lat, lon, display_name, source)])
+
+    def put_many(
+        self,
+        records: Iterable[Tuple[str, Optional[float], Optional[float], str, str]],
+    ) -> None:
+        """
+        Store several geocoding results in a single transaction.
+
+        Existing addresses are updated with new values, as with put(). The
+        state code is derived from each normalized address.
+
+        Args:
+            records: Tuples of (normalized_address, lat, lon, display_name, source).
+        """
+        # One timestamp (unix seconds) for the whole batch, bound rather than computed per row
+        now = int(time.time())
+        rows = [(*record, now, self.state_code_of(record[0])) for record in records]
+        if not rows:
+            return
+
+        with self._writer_lock:
+            conn = self._get_writer()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_SQL_PUT, rows)
+            except BaseException:
+                conn.rollback()
+                raise
             conn.commit()
-        finally:
-            conn.close()
+            self._forget(row[0] for row in rows)
 
     def clear_by_address(self, normalized_address: str) -> bool:
         """
@@ -159,18 +516,10 @@ class GeocodingCache:
         Returns:
             True if entry was deleted, False if not found.
         """
-        conn = self.connect()
-        try:
-            cur = conn.cursor()
-            cur.execute(
-                "DELETE FROM addresses WHERE normalized_address = ?",
-                (normalized_address,),
-            )
-            deleted = cur.rowcount > 0
-            conn.commit()
-            return deleted
-        finally:
-            conn.close()
+        with self._writer_lock:
+            cur = self._get_writer().execute(_SQL_DELETE, (normalized_address,))
+            self._forget([normalized_address])
+            return cur.rowcount > 0
 
     def clear_by_addresses(self, normalized_addresses: list[str]) -> int:
         """
@@ -185,27 +534,22 @@ class GeocodingCache:
         if not normalized_addresses:
             return 0
 
-        conn = self.connect()
-        try:
-            cur = conn.cursor()
-            # Use parameterized query with IN clause
-            placeholders = ",".join("?" * len(normalized_addresses))
-            cur.execute(
+        # Use parameterized query with IN clause
+        placeholders = ",".join("?" * len(normalized_addresses))
+        with self._writer_lock:
+            cur = self._get_writer().execute(
                 f"DELETE FROM addresses WHERE normalized_address IN ({placeholders})",
                 normalized_addresses,
             )
-            deleted = cur.rowcount
-            conn.commit()
-            return deleted
-        finally:
-            conn.close()
+            self._forget(normalized_addresses)
+            return cur.rowcount
 
     def clear_by_state(self, state_code: str) -> int:
         """
         Clear cache entries for a specific state.
 
-        Deletes all cached addresses that contain the state code in their
-        normalized address string (e.g., "IL 62701" or ", IL ").
+        Deletes all cached addresses whose normalized address carries the
+        state code (e.g., "..., IL 62701, USA"), using the state_code index.
 
         Args:
             state_code: Two-letter state code (e.g., "IL", "CA").
@@ -213,21 +557,10 @@ class GeocodingCache:
         Returns:
             Number of entries deleted.
         """
-        conn = self.connect()
-        try:
-            cur = conn.cursor()
-            # Match addresses containing ", STATE " or " STATE zipcode"
-            # This pattern should match our normalized format
-            pattern = f"%, {state_code.upper()} %"
-            cur.execute(
-                "DELETE FROM addresses WHERE normalized_address LIKE ?",
-                (pattern,),
-            )
-            deleted = cur.rowcount
-            conn.commit()
-            return deleted
-        finally:
-            conn.close()
+        with self._writer_lock:
+            cur = self._get_writer().execute(_SQL_DELETE_STATE, (state_code.upper(),))
+            self._forget(None)
+            return cur.rowcount
 
     def get_cache_stats(self, state_code: Optional[str] = None) -> Dict[str, int]:
         """
@@ -239,60 +572,48 @@ class GeocodingCache:
         Returns:
             Dictionary with keys: total, successful, failed.
         """
-        conn = self.connect()
-        try:
-            cur = conn.cursor()
-
+        # One pass computes both counts; SUM is NULL on an empty table
+        with self._reader() as conn:
             if state_code:
-                pattern = f"%, {state_code.upper()} %"
-                # Total entries for state
-                cur.execute(
-                    "SELECT COUNT(*) FROM addresses WHERE normalized_address LIKE ?",
-                    (pattern,),
-                )
-                total = cur.fetchone()[0]
-
-                # Successful entries (have lat/lon)
-                cur.execute(
-                    "SELECT COUNT(*) FROM addresses WHERE normalized_address LIKE ? AND latitude IS NOT NULL AND longitude IS NOT NULL",
-                    (pattern,),
-                )
-                successful = cur.fetchone()[0]
+                row = conn.execute(_SQL_STATS_STATE, (state_code.upper(),)).fetchone()
             else:
-                # Total entries
-                cur.execute("SELECT COUNT(*) FROM addresses")
-                total = cur.fetchone()[0]
-
-                # Successful entries (have lat/lon)
-                cur.execute(
-                    "SELECT COUNT(*) FROM addresses WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
-                )
-                successful = cur.fetchone()[0]
-
-            failed = total - successful
-
-            return {
-                "total": total,
-                "successful": successful,
-                "failed": failed,
-            }
-        finally:
-            conn.close()
+                row = conn.execute(_SQL_STATS).fetchone()
+        total, successful = row
+
+        failed = total - successful
+
+        return {
+            "total": total,
+            "successful": successful,
+            "failed": failed,
+        }
 
     def clear(self) -> bool:
         """
         Clear the entire cache by deleting the database file.
 
+        The WAL and shared-memory sidecar files are removed as well so a
+        stale log is never replayed into a fresh database.
+
         Returns:
             True if cache was cleared, False if cache file didn't exist.
         """
+        self._disconnect()
+        self._forget(None)
+        with self._schema_lock:
+            self._schema_initialized = False
         cache_path = self.get_cache_path()
+        for suffix in ("-wal", "-shm"):
+            sidecar = cache_path.with_name(cache_path.name + suffix)
+            if sidecar.exists():
+                sidecar.unlink()
         if cache_path.exists():
             cache_path.unlink()
             return True
         return False
 
     @staticmethod
+    @functools.lru_cache(maxsize=8192)
     def normalize_address(address: str, city: str, state: str, zip5: str) -> str:
         """
         Normalize an address into a consistent format for cache lookups.
@@ -300,6 +621,8 @@ class GeocodingCache:
         Creates a comma-separated string with non-empty components:
         "address, city, state zip, USA"
 
+        Results are memoized since many rows share the same components.
+
         Args:
             address: Street address.
             city: City name.
@@ -309,8 +632,27 @@ class GeocodingCache:
         Returns:
             Normalized address string.
         """
-        parts = [address.strip(), city.strip(), f"{state.strip()} {zip5.strip()}", "USA"]
-        return ", ".join([p for p in parts if p])
+        a = address.strip()
+        c = city.strip()
+        # Always non-empty (contains the separating space), so never filtered
+        sz = f"{state.strip()} {zip5.strip()}"
+        if a:
+            return f"{a}, {c}, {sz}, USA" if c else f"{a}, {sz}, USA"
+        return f"{c}, {sz}, USA" if c else f"{sz}, USA"
+
+    @staticmethod
+    def state_code_of(normalized_address: str) -> Optional[str]:
+        """
+        Extract the two-letter state code from a normalized address.
+
+        Args:
+            normalized_address: Address produced by normalize_address().
+
+        Returns:
+            Upper-case state code, or None if the address has no state part.
+        """
+        matches = _STATE_RE.findall(normalized_address)
+        return matches[-1].upper() if matches else None
 
     def __enter__(self) -> GeocodingCache:
         """Context manager entry."""
@@ -318,4 +660,4 @@ class GeocodingCache:
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         """Context manager exit."""
-        # No cleanup needed as connections are opened/closed per operation
+        self.close()
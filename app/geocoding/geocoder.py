@@ -0,0 +1,225 @@
+"""
+Cache-first batch geocoding.
+
+Combines GeocodingCache and a GeocodingStrategy into one batch pipeline:
+look every address up in the cache in one pass, fetch only the misses
+through the rate-limited pool, and write new results back in batches.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, as_completed
+from typing import Any, Callable, Collection, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from .cache import GeocodingCache
+from .runner import RateLimitedGeocoder
+from .strategy import GeocodingStrategy
+
+# Number of fetched results buffered before they are written with put_many()
+FLUSH_EVERY = 50
+
+
+class Geocoder:
+    """
+    Geocodes batches of normalized addresses with the cache in front.
+
+    Each miss is resolved by trying its fallback queries in order until
+    one succeeds. Every query passes through the strategy's token bucket,
+    so no explicit sleeping is needed by callers. Successful provider
+    answers are remembered per query for the geocoder's lifetime, and
+    identical queries in flight at the same time share one request, so
+    fallbacks shared by many addresses (e.g. the same "City, ST") are
+    only sent once. Empty answers are not remembered, since the provider
+    cannot tell a transient failure from a genuine no-match.
+
+    Results are dictionaries with keys lat, lon, display_name, source,
+    plus:
+        cached: True if the entry came from the cache.
+        label: Label of the query that matched ("cache" for cache hits).
+        attempts: Number of queries tried (sent, or answered by an
+            identical successful query).
+
+    Failed lookups have lat/lon set to None.
+
+    Attributes:
+        strategy: Geocoding provider used for cache misses.
+        cache: Cache consulted before and updated after fetching.
+    """
+
+    def __init__(
+        self,
+        strategy: GeocodingStrategy,
+        cache: GeocodingCache,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the geocoder.
+
+        Args:
+            strategy: Geocoding provider used for cache misses.
+            cache: Cache shared with other workers and the UI.
+            max_workers: Optional override for the request pool size.
+        """
+        self.strategy = strategy
+        self.cache = cache
+        self._runner = RateLimitedGeocoder(strategy, max_workers=max_workers)
+        # Successful or in-flight provider request per query string; shared by pool threads
+        self._answers: Dict[str, Future] = {}
+        self._answers_lock = threading.Lock()
+
+    def geocode_many(
+        self,
+        addresses: Iterable[str],
+        fallbacks: Optional[Mapping[str, Sequence[Tuple[str, str]]]] = None,
+        uncacheable_labels: Collection[str] = (),
+        should_cancel: Optional[Callable[[], bool]] = None,
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Geocode many normalized addresses.
+
+        Args:
+            addresses: Normalized addresses; duplicates are resolved once.
+            fallbacks: Optional (query, label) lists per address. Addresses
+                without an entry are queried as-is with the label "full".
+            uncacheable_labels: Labels whose matches are returned but not
+                written to the cache (e.g. coarse city-level fallbacks).
+            should_cancel: Polled before and while waiting for each provider
+                request; once it returns True remaining misses are left
+                unresolved without waiting out the rate limit.
+            on_result: Called in the calling thread as each address resolves,
+                cache hits first.
+
+        Returns:
+            Mapping of every address to its result, or None if it was not
+            resolved because the run was cancelled.
+        """
+        fallbacks = fallbacks or {}
+        cancelled = should_cancel or (lambda: False)
+        unique = list(dict.fromkeys(addresses))
+        results: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(unique)
+
+        # 1) one batched cache lookup for the whole set
+        for norm, hit in self.cache.get_many(unique).items():
+            result = {
+                "lat": hit["lat"],
+                "lon": hit["lon"],
+                "display_name": hit["display_name"],
+                "source": hit["source"],
+                "cached": True,
+                "label": "cache",
+                "attempts": 0,
+            }
+            results[norm] = result
+            if on_result:
+                on_result(norm, result)
+
+        # 2) the misses go to the rate-limited pool
+        misses = [norm for norm in unique if results[norm] is None]
+        if not misses:
+            return results
+
+        source = self.strategy.get_source_name()
+        pending: list[Tuple[str, Optional[float], Optional[float], str, str]] = []
+        futures = {
+            self._runner.submit(
+                self._fetch, fallbacks.get(norm) or [(norm, "full")], cancelled
+            ): norm
+            for norm in misses
+        }
+        try:
+            for future in as_completed(futures):
+                norm = futures[future]
+                result = future.result()
+                if result is None:
+                    continue
+                results[norm] = result
+                # 3) buffered write-back; failures are cached so they are not retried
+                if result["lat"] is None:
+                    pending.append((norm, None, None, "", "none"))
+                elif result["label"] not in uncacheable_labels:
+                    pending.append(
+                        (norm, result["lat"], result["lon"], result["display_name"], source)
+                    )
+                if len(pending) >= FLUSH_EVERY:
+                    self.cache.put_many(pending)
+                    pending = []
+                if on_result:
+                    on_result(norm, result)
+        finally:
+            for future in futures:
+                future.cancel()
+            self.cache.put_many(pending)
+        return results
+
+    def _fetch(
+        self, queries: Sequence[Tuple[str, str]], cancelled: Callable[[], bool]
+    ) -> Optional[Dict[str, Any]]:
+        # Runs on a pool thread: try each fallback query until one matches
+        attempts = 0
+        for query, label in queries:
+            if cancelled():
+                return None
+            got = self._ask(query, cancelled)
+            # Stop was pressed while waiting on the rate limit: nothing was sent
+            if got is None and cancelled():
+                return None
+            attempts += 1
+            if got:
+                return {
+                    "lat": got["lat"],
+                    "lon": got["lon"],
+                    "display_name": got["display_name"],
+                    "source": self.strategy.get_source_name(),
+                    "cached": False,
+                    "label": label,
+                    "attempts": attempts,
+                }
+        return {
+            "lat": None,
+            "lon": None,
+            "display_name": "",
+            "source": "none",
+            "cached": False,
+            "label": "",
+            "attempts": attempts,
+        }
+
+    def _ask(self, query: str, cancelled: Callable[[], bool]) -> Optional[Dict[str, Any]]:
+        # One provider request per query text: later callers reuse a success and
+        # concurrent callers wait for the request already in flight
+        while True:
+            with self._answers_lock:
+                pending = self._answers.get(query)
+                owner = pending is None
+                if owner:
+                    pending = self._answers[query] = Future()
+            if not owner:
+                got = pending.result()
+                if got is not None or cancelled():
+                    return got
+                # The shared request came back empty; ask again rather than trust it
+                continue
+            got = None
+            try:
+                got = self._runner.geocode(query, cancelled)
+            finally:
+                if got is None:
+                    # Failed, cancelled or no match: forget it so later callers retry
+                    with self._answers_lock:
+                        del self._answers[query]
+                pending.set_result(got)
+            return got
+
+    def close(self) -> None:
+        """Shut down the request pool."""
+        self._runner.close()
+
+    def __enter__(self) -> Geocoder:
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
@@ -1,11 +1,36 @@
+from __future__ import annotations
+
 import random
 import re
-from typing import Any, Callable, Dict, Optional
-
-import requests
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional
 
 from .strategy import GeocodingStrategy
 
+if TYPE_CHECKING:
+    import requests
+
+try:
+    # Optional faster JSON parser for response bodies; stdlib json otherwise
+    import orjson
+except ImportError:
+    orjson = None
+
+# Unit-level noise: "Suite 200", "Ste. B", "Apt 4", "# 12", ...
+_UNIT_RE = re.compile(
+    r"(?:,?\s*(?:suite|ste|unit|apt|apartment|room|rm)\.?\s*[#\w\d-]+|,?\s*#\s*\d+)",
+    re.IGNORECASE,
+)
+_SPACE_BEFORE_COMMA_RE = re.compile(r"\s+,")
+_ZIP_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
+
+PUBLIC_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+
+# HTTP statuses retried by the session (rate limited or transient server errors)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Address components that place a result on a street-like feature
+_TRANSPORT_KEYS = frozenset(("road", "pedestrian", "highway"))
+
 
 class NominatimStrategy(GeocodingStrategy):
     """
@@ -22,11 +47,61 @@ class NominatimStrategy(GeocodingStrategy):
         email: str,
         user_agent: str = "VRPTW-Workflow/0.1",
         logger: Optional[Callable[[str], None]] = None,
+        base_url: Optional[str] = None,
+        min_interval: Optional[float] = None,
     ):
+        """
+        Args:
+            email: Contact address sent in the User-Agent (Nominatim policy).
+            user_agent: Application identifier.
+            logger: Optional callable receiving diagnostic messages.
+            base_url: Search endpoint of a self-hosted Nominatim; defaults to
+                the public server.
+            min_interval: Seconds between requests. Only meant for self-hosted
+                servers; the public server keeps its ~1 req/s policy delay.
+        """
         self.email = email
         self.user_agent = user_agent
-        self.base_url = "https://nominatim.openstreetmap.org/search"
+        self.base_url = base_url or PUBLIC_SEARCH_URL
+        self.min_interval = min_interval
         self.logger = logger or (lambda msg: None)
+        # Created on first request so importing this module does not pull in requests
+        self._session: Optional[requests.Session] = None
+        # Keep-alive connections kept by the session; set_concurrency() raises it
+        self._pool_size = 1
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # Keep-alive connections reused across requests: one at a time against the
+            # public server (1 req/s), up to one per worker on a self-hosted one.
+            # Throttling and transient server errors are retried on the same connection
+            # with backoff (honouring Retry-After); the last response is returned
+            # rather than raised so it is logged like any other status
+            retry = Retry(
+                total=3,
+                backoff_factor=1.0,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset(("GET",)),
+                raise_on_status=False,
+            )
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=self._pool_size, max_retries=retry
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(
+                {
+                    "User-Agent": f"{self.user_agent} (+{self.email})",
+                    "Accept-Language": "en",
+                }
+            )
+            self._session = session
+        return self._session
 
     # ------------------------------------------------------------------
     # Address cleaning (very conservative)
@@ -38,18 +113,10 @@ class NominatimStrategy(GeocodingStrategy):
         Only remove unit-level noise.
         Never remove building identifiers or floors.
         """
-        patterns = [
-            r",?\s*(?:suite|ste|unit|apt|apartment|room|rm)\.?\s*[#\w\d-]+",
-            r",?\s*#\s*\d+",
-        ]
-
-        cleaned = address
-        for pat in patterns:
-            cleaned = re.sub(pat, "", cleaned, flags=re.IGNORECASE)
-
-        cleaned = re.sub(r"\s+,", ",", cleaned)
-        cleaned = re.sub(r"\s{2,}", " ", cleaned)
-        return cleaned.strip()
+        cleaned = _UNIT_RE.sub("", address)
+        cleaned = _SPACE_BEFORE_COMMA_RE.sub(",", cleaned)
+        # split/join collapses whitespace runs and trims both ends in C
+        return " ".join(cleaned.split())
 
     # ------------------------------------------------------------------
     # Core geocode method
@@ -63,14 +130,8 @@ class NominatimStrategy(GeocodingStrategy):
         3) relaxed query (no ZIP)
         """
 
-        attempts = [
-            self._light_clean(query),
-            query,
-            self._strip_postal_code(query),
-        ]
-
         seen = set()
-        for attempt in attempts:
+        for attempt in self._attempts(query):
             if not attempt or attempt in seen:
                 continue
             seen.add(attempt)
@@ -84,15 +145,18 @@ class NominatimStrategy(GeocodingStrategy):
         self.logger(f"Nominatim failed all attempts for: {query[:60]}...")
         return None
 
+    def _attempts(self, query: str) -> Iterator[str]:
+        """Yield query variants lazily so later cleanups only run when needed."""
+        yield self._light_clean(query)
+        yield query
+        yield self._strip_postal_code(query)
+
     # ------------------------------------------------------------------
     # One HTTP request
     # ------------------------------------------------------------------
 
     def _single_geocode_attempt(self, query: str) -> Optional[Dict[str, Any]]:
-        headers = {
-            "User-Agent": f"{self.user_agent} (+{self.email})",
-            "Accept-Language": "en",
-        }
+        import requests
 
         params = {
             "q": query,
@@ -102,9 +166,8 @@ class NominatimStrategy(GeocodingStrategy):
         }
 
         try:
-            resp = requests.get(
+            resp = self._get_session().get(
                 self.base_url,
-                headers=headers,
                 params=params,
                 timeout=10,
             )
@@ -117,7 +180,8 @@ class NominatimStrategy(GeocodingStrategy):
                 self.logger(f"Nominatim HTTP {resp.status_code}: {resp.text[:120]}")
                 return None
 
-            data = resp.json()
+            # orjson.JSONDecodeError subclasses ValueError, handled below
+            data = orjson.loads(resp.content) if orjson is not None else resp.json()
             if not data:
                 return None
 
@@ -140,56 +204,36 @@ class NominatimStrategy(GeocodingStrategy):
     def _select_best_result(self, results: list[dict]) -> Optional[Dict[str, Any]]:
         """
         Rank results by address structure, not Nominatim 'type'.
-        """
 
-        best_transport_no_number = None
-
-        for item in results:
-            lat = item.get("lat")
-            lon = item.get("lon")
-            addr = item.get("address", {})
-
-            if not lat or not lon:
-                continue
-
-            # US only
-            if addr.get("country_code") != "us":
-                continue
-
-            has_transport = any(key in addr for key in ("road", "pedestrian", "highway"))
-            has_number = "house_number" in addr
-
-            # Tier 1: true street address
-            if has_transport and has_number:
-                return {
-                    "lat": float(lat),
-                    "lon": float(lon),
-                    "display_name": item.get("display_name", ""),
-                }
-
-            # Tier 2: highway / rural frontage
-            if has_transport and not best_transport_no_number:
-                best_transport_no_number = {
-                    "lat": float(lat),
-                    "lon": float(lon),
-                    "display_name": item.get("display_name", ""),
-                }
+        Each candidate is classified once (see _classify); the first
+        result of the highest tier wins.
+        """
+        scored = [(mask, item) for item in results if (mask := self._classify(item))]
+        if not scored:
+            return None
+        _, item = max(scored, key=lambda t: t[0])
+        return {
+            "lat": float(item["lat"]),
+            "lon": float(item["lon"]),
+            "display_name": item.get("display_name", ""),
+        }
 
-        # Tier 2 fallback
-        if best_transport_no_number:
-            return best_transport_no_number
-
-        # Tier 3: last-resort US centroid
-        for item in results:
-            addr = item.get("address", {})
-            if addr.get("country_code") == "us" and item.get("lat") and item.get("lon"):
-                return {
-                    "lat": float(item["lat"]),
-                    "lon": float(item["lon"]),
-                    "display_name": item.get("display_name", ""),
-                }
+    @staticmethod
+    def _classify(item: dict) -> int:
+        """
+        Score a result as a bitmask: bit2 = US, bit1 = street number on a
+        road, bit0 = on a road.
 
-        return None
+        Tier 1 (true street address) scores 7, Tier 2 (highway / rural
+        frontage) 5 and Tier 3 (last-resort US centroid) 4. Results without
+        coordinates or outside the US score 0 and are dropped.
+        """
+        addr = item.get("address", {})
+        if not item.get("lat") or not item.get("lon") or addr.get("country_code") != "us":
+            return 0
+        has_transport = not _TRANSPORT_KEYS.isdisjoint(addr)
+        has_number = "house_number" in addr
+        return 4 + 2 * (has_transport and has_number) + has_transport
 
     # ------------------------------------------------------------------
     # Helpers
@@ -198,11 +242,23 @@ class NominatimStrategy(GeocodingStrategy):
     @staticmethod
     def _strip_postal_code(address: str) -> str:
         """Remove ZIP codes as a last-resort relaxation."""
-        return re.sub(r"\b\d{5}(?:-\d{4})?\b", "", address).strip()
+        return _ZIP_RE.sub("", address).strip()
 
     def get_source_name(self) -> str:
         return "nominatim"
 
     def get_rate_limit_delay(self) -> float:
+        if self.min_interval is not None:
+            return self.min_interval
         # Add jitter to avoid fingerprinting
         return 1.05 + random.uniform(0.1, 0.3)
+
+    def set_concurrency(self, workers: int) -> None:
+        self._pool_size = max(1, workers)
+        # An existing session is rebuilt with the new pool size on the next request
+        self.close()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,164 @@
+"""
+Rate-limited concurrent execution of geocoding strategies.
+
+Strategies only describe their politeness as a delay between requests.
+This module turns that delay into a token bucket so several requests can
+be in flight at once while the overall request rate stays within the
+provider's limit.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .strategy import GeocodingStrategy
+
+# Upper bound on concurrent requests for fast providers (e.g., Google Maps)
+MAX_WORKERS = 32
+
+# Longest a cancellable take() sleeps before re-checking for cancellation
+CANCEL_POLL = 0.1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each take() consumes one token, blocking until one is available.
+
+    Attributes:
+        rate: Tokens added per second.
+        capacity: Maximum number of tokens that can accumulate (burst size).
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second; must be positive.
+            capacity: Maximum burst size; at least 1.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+
+    def take(self, should_cancel: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Consume one token, waiting for the bucket to refill if needed.
+
+        Args:
+            should_cancel: Optional callable polled while waiting; once it
+                returns True the wait is abandoned without taking a token.
+
+        Returns:
+            True if a token was taken, False if the wait was cancelled.
+        """
+        with self._cond:
+            while True:
+                if should_cancel is not None and should_cancel():
+                    return False
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+                if should_cancel is not None:
+                    wait = min(wait, CANCEL_POLL)
+                self._cond.wait(wait)
+
+
+class RateLimitedGeocoder:
+    """
+    Runs a strategy's geocode() on a thread pool behind a token bucket.
+
+    The pool size follows the strategy's rate limit: one worker for
+    Nominatim (~1 req/s), up to MAX_WORKERS for providers with a short
+    delay such as Google Maps.
+
+    Attributes:
+        strategy: The geocoding strategy used for every request.
+        bucket: Token bucket shared by all workers.
+        max_workers: Number of threads issuing requests.
+    """
+
+    def __init__(self, strategy: GeocodingStrategy, max_workers: Optional[int] = None) -> None:
+        """
+        Initialize the runner.
+
+        Args:
+            strategy: Geocoding strategy to call.
+            max_workers: Optional override for the pool size.
+        """
+        delay = max(strategy.get_rate_limit_delay(), 1e-6)
+        self.strategy = strategy
+        self.bucket = TokenBucket(rate=1.0 / delay)
+        if max_workers is None:
+            max_workers = min(MAX_WORKERS, max(1, int(1.0 / delay)))
+        self.max_workers = max_workers
+        strategy.set_concurrency(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geocode")
+
+    def geocode(
+        self, query: str, should_cancel: Optional[Callable[[], bool]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Geocode a single query once a rate-limit token is available.
+
+        Args:
+            query: Address string to geocode.
+            should_cancel: Optional callable; if it returns True while
+                waiting for a token, no request is sent.
+
+        Returns:
+            The strategy's result dictionary, or None (also when cancelled).
+        """
+        if not self.bucket.take(should_cancel):
+            return None
+        return self.strategy.geocode(query)
+
+    def map(self, queries: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Geocode many queries concurrently.
+
+        Args:
+            queries: Address strings to geocode.
+
+        Returns:
+            Results in the same order as ``queries``.
+        """
+        return list(self._executor.map(self.geocode, queries))
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Run ``fn(*args)`` on the pool.
+
+        ``fn`` is expected to call geocode() for each request it makes so
+        every request still passes through the token bucket.
+
+        Returns:
+            Future for the call's result.
+        """
+        return self._executor.submit(fn, *args)
+
+    def close(self) -> None:
+        """Shut down the thread pool, waiting for in-flight requests."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> RateLimitedGeocoder:
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
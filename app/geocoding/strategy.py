@@ -42,3 +42,20 @@ class GeocodingStrategy(ABC):
         Returns:
             Delay in seconds to wait between geocoding requests
         """
+
+    def set_concurrency(self, workers: int) -> None:
+        """Tell the strategy how many threads will call geocode() at once.
+
+        The default implementation does nothing; providers that pool HTTP
+        connections override it to size the pool.
+
+        Args:
+            workers: Number of threads issuing requests.
+        """
+
+    def close(self) -> None:
+        """Release any network resources held by the strategy.
+
+        The default implementation does nothing; providers that keep
+        persistent HTTP sessions override it.
+        """
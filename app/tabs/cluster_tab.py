@@ -1,10 +1,29 @@
 from __future__ import annotations
 
+import contextlib
+import copy
 import csv
+import functools
+import hashlib
+import importlib.util
+import itertools
+import json
+import os
+import threading
 import webbrowser
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from PyQt6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    Qt,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+)
 from PyQt6.QtGui import QTextCursor
 from PyQt6.QtWidgets import (
     QFormLayout,
@@ -15,20 +34,671 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QSizePolicy,
     QSpinBox,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QTabWidget,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
+from app.tabs.workspace_tab import subdir_names
+
+# Rows shown in the clustered.csv preview table
+PREVIEW_ROWS = 1000
+
+# Marker colors in the cluster map preview, cycled by cluster_id
+MAP_PALETTE = (
+    "#1f77b4",
+    "#ff7f0e",
+    "#2ca02c",
+    "#d62728",
+    "#9467bd",
+    "#8c564b",
+    "#e377c2",
+    "#7f7f7f",
+    "#bcbd22",
+    "#17becf",
+)
+
+# Rows written to clustered.csv per csv.writer.writerows() call
+WRITE_BATCH_ROWS = 4096
+
+# Above this many unique points a state is fitted with MiniBatchKMeans instead of exact KMeans
+MINIBATCH_THRESHOLD = 5_000
+
+# Cluster All aims for this many jobs per worker; extra states are batched into jobs
+JOBS_PER_WORKER = 4
+
+# Bump when the fitting procedure changes so cached clustered.csv files are refitted
+CLUSTER_META_VERSION = 3
+
+# Heavy clustering dependencies, imported on first use and then reused
+_pd: Any = None
+_np: Any = None
+_skcluster: Any = None
+
+
+def _lazy_deps() -> Tuple[Any, Any, Any]:
+    """
+    Import pandas, numpy and sklearn.cluster once per process.
+
+    Returns:
+        Tuple of (pandas, numpy, sklearn.cluster).
+
+    Raises:
+        ImportError: If any of the packages is not installed.
+    """
+    global _pd, _np, _skcluster
+    if _skcluster is None:
+        import numpy as np
+        import pandas as pd
+        import sklearn.cluster as skcluster
+
+        _pd, _np, _skcluster = pd, np, skcluster
+    return _pd, _np, _skcluster
+
+
+@functools.lru_cache(maxsize=None)
+def _start_import_warmup() -> None:
+    """
+    Import the clustering dependencies on a background thread, once per process.
+
+    pandas and scikit-learn take seconds to import; doing it while the user
+    is still browsing means the first Cluster click does not pay for it.
+    """
+
+    def warm() -> None:
+        try:
+            _lazy_deps()
+        except Exception:
+            # Reported properly when clustering is actually requested
+            pass
+
+    threading.Thread(target=warm, name="cluster-import-warmup", daemon=True).start()
+
+
+@functools.lru_cache(maxsize=None)
+def _has_pyarrow() -> bool:
+    """Return True if the optional pyarrow package is installed (checked once)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+@functools.lru_cache(maxsize=64)
+def _latlon_columns(columns: Tuple[str, ...]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Find the latitude/longitude columns (lat/lon or latitude/longitude, any case).
+
+    Cached by header, since every state's CSV normally shares the same columns.
+
+    Returns:
+        Tuple of (lat_col, lon_col); either is None if missing.
+    """
+    cols = {c.lower(): c for c in columns}
+    lat_col = cols.get("lat") or cols.get("latitude")
+    lon_col = cols.get("lon") or cols.get("longitude")
+    return lat_col, lon_col
+
+
+def _read_csv(pd: Any, path: Path, **kwargs: Any) -> Any:
+    """
+    Read a CSV with pandas, using the multithreaded pyarrow parser when installed.
+
+    pyarrow is optional; without it pandas' default C parser is used.
+    """
+    if _has_pyarrow():
+        return pd.read_csv(path, engine="pyarrow", **kwargs)
+    return pd.read_csv(path, **kwargs)
+
+
+def cluster_state_file(
+    state: str, geo_csv: Path, k: int, log: Callable[[str], None], n_init: int = 1
+) -> bool:
+    """
+    Cluster one state's geocoded.csv into clustered.csv next to it.
+
+    Pure with respect to Qt so it can run on a worker thread; progress and
+    errors are reported through ``log``.
+
+    Args:
+        state: State code, used in log messages.
+        geo_csv: Path to the state's geocoded.csv.
+        k: Requested number of clusters (reduced to the unique point count).
+        log: Callable receiving each log line.
+        n_init: k-means++ restarts for exact KMeans; one is enough for planar
+            lat/lon data and keeps Cluster All fast.
+
+    Returns:
+        True if clustered.csv was written.
+    """
+    out_csv = geo_csv.with_name("clustered.csv")
+    meta_path = geo_csv.with_name(".cluster.meta")
+    if not geo_csv.exists():
+        log(f"State {state}: geocoded.csv not found at {geo_csv}")
+        return False
+    # Skip the fit when clustered.csv was produced from identical inputs
+    params = {"k": k, "n_init": n_init, "version": CLUSTER_META_VERSION}
+    prev = _read_meta(meta_path) or {}
+    reusable = out_csv.exists() and all(prev.get(key) == v for key, v in params.items())
+    try:
+        input_stat = _stat_fingerprint(geo_csv)
+        # Size + mtime match: the file was not rewritten, so it need not be hashed.
+        # Only trusted when the meta was written after that mtime, since a write in
+        # the same timestamp tick could otherwise go unnoticed
+        if reusable and prev.get("input_stat") == input_stat and _stat_settled(meta_path, geo_csv):
+            log(f"State {state}: geocoded.csv and k={k} unchanged; reusing clustered.csv (cached).")
+            return True
+        meta = {"input_sha": _file_sha256(geo_csv), "input_stat": input_stat, **params}
+    except OSError as e:
+        log(f"Failed reading {geo_csv}: {e}")
+        return False
+    if reusable and prev.get("input_sha") == meta["input_sha"]:
+        # Touched or re-saved with the same contents: refresh the recorded stat
+        _write_meta(meta_path, {**prev, "input_stat": input_stat})
+        log(f"State {state}: geocoded.csv and k={k} unchanged; reusing clustered.csv (cached).")
+        return True
+    meta_path.unlink(missing_ok=True)
+    # Centers of this state's previous fit seed the next one (see below)
+    prev_centers = prev.get("centers") if prev.get("version") == CLUSTER_META_VERSION else None
+    try:
+        pd, np, skcluster = _lazy_deps()
+    except Exception as e:
+        log(f"Clustering requires pandas, numpy and scikit-learn: {e}")
+        return False
+    try:
+        with geo_csv.open("r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+    except Exception as e:
+        log(f"Failed reading {geo_csv}: {e}")
+        return False
+    lat_col, lon_col = _latlon_columns(tuple(header))
+    if not lat_col or not lon_col:
+        log("Could not find latitude/longitude columns (lat/lon or latitude/longitude).")
+        return False
+    try:
+        # Only the two coordinate columns are parsed, straight to float32 so no type
+        # inference or conversion pass is needed; the other columns are copied
+        # through as text when clustered.csv is written
+        df = _read_csv(
+            pd, geo_csv, usecols=[lat_col, lon_col], dtype={lat_col: "float32", lon_col: "float32"}
+        )
+    except Exception as e:
+        log(f"Failed reading {geo_csv}: {e}")
+        return False
+    try:
+        # Fill one float32 buffer straight from the two columns instead of copying a
+        # 2-D block out of the frame. float32 halves
+        # the memory traffic of the distance kernels; its ~7.6e-6 degree step at
+        # |lon| < 128 (under a metre) is far finer than geocoding accuracy
+        X = np.empty((len(df), 2), dtype=np.float32)
+        X[:, 0] = df[lat_col].to_numpy(dtype=np.float32, copy=False)
+        X[:, 1] = df[lon_col].to_numpy(dtype=np.float32, copy=False)
+        if len(X) == 0:
+            log(f"State {state}: no rows to cluster.")
+            return False
+        # Fit on unique coordinates weighted by multiplicity (colocated sites count once
+        # per distance evaluation), then scatter labels back through the inverse index
+        keys, inverse, counts = np.unique(
+            _row_keys(np, X), return_inverse=True, return_counts=True
+        )
+        uniq = keys.view(np.float32).reshape(-1, 2)
+        # Ensure k does not exceed the number of unique coordinate pairs to avoid ConvergenceWarning
+        n_unique = int(uniq.shape[0])
+        if n_unique == 0:
+            log(f"State {state}: no unique coordinate rows to cluster.")
+            return False
+        k_eff = max(1, min(k, len(X), n_unique))
+        if k_eff != k:
+            log(f"State {state}: adjusted k from {k} to {k_eff} due to {n_unique} unique points.")
+        points = _project_equirectangular(np, uniq)
+        if k_eff == 1 or k_eff == n_unique:
+            # Nothing to optimise: one cluster, or one cluster per unique point. Small
+            # states often land here, and skipping sklearn saves its per-fit setup
+            if k_eff == 1:
+                unique_labels = np.zeros(n_unique, dtype=np.int64)
+                centers = np.average(points, axis=0, weights=counts)[None, :]
+            else:
+                unique_labels = np.arange(n_unique, dtype=np.int64)
+                centers = points
+            log(f"State {state}: k={k_eff} with {n_unique} unique points needs no fit.")
+        else:
+            # Re-clustering after a few sites changed starts from the previous centers:
+            # fewer iterations to converge and cluster ids stay stable between runs
+            init: Any = "k-means++"
+            warm = bool(prev_centers and len(prev_centers) == k_eff)
+            if warm:
+                init = np.asarray(prev_centers, dtype=np.float32)
+            if n_unique > MINIBATCH_THRESHOLD:
+                # Mini-batches touch a fraction of the points per iteration
+                model = skcluster.MiniBatchKMeans(
+                    n_clusters=k_eff,
+                    init=init,
+                    batch_size=min(1024, n_unique),
+                    n_init=1 if warm else 3,
+                    max_iter=100,
+                    random_state=42,
+                    reassignment_ratio=0.01,
+                )
+            else:
+                # The points are already unique, so Elkan's triangle-inequality bounds prune
+                # most distance evaluations; n_init is pinned (sklearn's "auto" meant 10
+                # restarts in older releases)
+                model = skcluster.KMeans(
+                    n_clusters=k_eff,
+                    algorithm="elkan",
+                    n_init=1 if warm else max(1, n_init),
+                    init=init,
+                    random_state=42,
+                )
+            log(
+                f"State {state}: fitting {type(model).__name__} "
+                f"({'warm start' if warm else f'n_init={model.n_init}'}) "
+                f"on {n_unique} unique points ({len(X)} rows, float32 coordinates)."
+            )
+            model.fit(points, sample_weight=counts)
+            unique_labels, centers = model.labels_, model.cluster_centers_
+        meta["centers"] = centers.tolist()
+        labels = unique_labels[inverse.reshape(-1)]
+        _write_clustered_csv(geo_csv, out_csv, labels.tolist())
+        _write_meta(meta_path, meta)
+        log(f"State {state}: wrote clustered.csv with {k_eff} clusters -> {out_csv}")
+        # Log quick stats: min/median/max cluster sizes and % singletons
+        try:
+            # Counts of non-empty clusters, computed in one pass over the labels
+            sizes = np.bincount(labels, minlength=k_eff)
+            sizes = sizes[sizes > 0]
+            if sizes.size:
+                singletons = int((sizes == 1).sum())
+                pct_single = 100.0 * singletons / sizes.size
+                log(
+                    f"State {state}: cluster sizes min/median/max = "
+                    f"{int(sizes.min())}/{float(np.median(sizes)):g}/{int(sizes.max())} | "
+                    f"{singletons} singleton clusters ({pct_single:.1f}%)."
+                )
+        except Exception:
+            pass
+        return True
+    except Exception as e:
+        log(f"State {state}: clustering failed: {e}")
+        return False
+
+
+def _project_equirectangular(np: Any, X: Any) -> Any:
+    """
+    Scale longitude by cos(mean latitude) so Euclidean distance tracks ground distance.
+
+    A degree of longitude shrinks with latitude (about 0.77 of a latitude degree
+    at 40N), so unscaled (lat, lon) clusters come out stretched east-west. Over
+    a single state this local projection is within a few percent of haversine
+    distance. Cluster centers are kept in this projected space.
+    """
+    scale = np.cos(np.radians(float(X[:, 0].mean())))
+    return X * np.asarray([1.0, scale], dtype=X.dtype)
+
+
+def _row_keys(np: Any, X: Any) -> Any:
+    """
+    View each (lat, lon) row of X as one scalar so uniqueness is a plain 1-D sort.
+
+    np.unique(X, axis=0) builds a structured copy and sorts it field by field;
+    a float32 pair packs into a single uint64 (wider rows into raw bytes), which
+    sorts many times faster. The view maps back with keys.view(X.dtype).
+    """
+    X = np.ascontiguousarray(X)
+    if X.dtype == np.float32 and X.shape[1] == 2:
+        return X.view(np.uint64).reshape(-1)
+    return X.view(np.dtype((np.void, X.dtype.itemsize * X.shape[1]))).reshape(-1)
+
+
+def _file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _stat_fingerprint(path: Path) -> List[int]:
+    """Return [size, mtime_ns] of a file, a cheap check for whether it was rewritten."""
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _stat_settled(meta_path: Path, path: Path) -> bool:
+    # True if meta_path was written strictly after path was last modified
+    try:
+        return meta_path.stat().st_mtime_ns > path.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def _read_meta(meta_path: Path) -> Optional[Dict[str, Any]]:
+    # Inputs recorded for the current clustered.csv, or None if absent/unreadable
+    try:
+        with meta_path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path: Path, meta: Dict[str, Any]) -> None:
+    try:
+        with meta_path.open("w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError:
+        pass
+
+
+def _write_clustered_csv(geo_csv: Path, out_csv: Path, labels: List[int]) -> None:
+    """
+    Stream geocoded.csv into clustered.csv, setting a cluster_id column per row.
+
+    Rows are copied as text rather than round-tripped through a DataFrame, so
+    values such as ZIP codes keep their original formatting. The file is
+    written to a temporary name and moved into place once complete.
+
+    Raises:
+        ValueError: If the number of data rows does not match ``labels``.
+    """
+    tmp = out_csv.with_name(out_csv.name + ".tmp")
+    preview: List[List[str]] = []
+    try:
+        with geo_csv.open("r", newline="", encoding="utf-8") as fin, tmp.open(
+            "w", newline="", encoding="utf-8", buffering=1 << 20
+        ) as fout:
+            reader = csv.reader(fin)
+            writer = csv.writer(fout, lineterminator="\n")
+            header = next(reader)
+            # Re-clustering a file that already has cluster_id overwrites it in place
+            cid = next((i for i, h in enumerate(header) if h == "cluster_id"), None)
+            if cid is None:
+                header = header + ["cluster_id"]
+            writer.writerow(header)
+            n = 0
+            # Blank lines are skipped to match how pandas counted the data rows
+            rows = (r for r in reader if r)
+            # Rows are handed to the C writer a batch at a time rather than one call each
+            while chunk := list(itertools.islice(rows, WRITE_BATCH_ROWS)):
+                if n + len(chunk) > len(labels):
+                    raise ValueError("geocoded.csv has more rows than cluster labels")
+                for row, label in zip(chunk, map(str, labels[n : n + len(chunk)])):
+                    if cid is None:
+                        row.append(label)
+                    else:
+                        row[cid] = label
+                writer.writerows(chunk)
+                if n < PREVIEW_ROWS:
+                    preview.extend(chunk[: PREVIEW_ROWS - n])
+                n += len(chunk)
+            if n != len(labels):
+                raise ValueError("geocoded.csv has fewer rows than cluster labels")
+        os.replace(tmp, out_csv)
+    finally:
+        tmp.unlink(missing_ok=True)
+    _write_preview_sidecar(header, preview, out_csv)
+
+
+def _write_preview_sidecar(header: List[str], rows: List[List[str]], csv_path: Path) -> None:
+    # Columnar copy of the previewed rows so selection skips CSV tokenizing (needs pyarrow)
+    sidecar = csv_path.with_suffix(".parquet")
+    try:
+        if _has_pyarrow():
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            width = len(header)
+            rows = [(r + [""] * width)[:width] for r in rows]
+            columns = list(zip(*rows)) or [() for _ in header]
+            arrays = [pa.array(list(col), type=pa.string()) for col in columns]
+            pq.write_table(pa.Table.from_arrays(arrays, names=header), sidecar)
+            return
+    except Exception:
+        pass
+    # Never leave a stale sidecar next to a freshly written CSV
+    sidecar.unlink(missing_ok=True)
+
+
+class _ClusterSignals(QObject):
+    # Carries (state, log lines, clustered.csv written) from pool threads to the GUI thread
+    finished = pyqtSignal(str, list, bool)
+
+
+class _ClusterJob(QRunnable):
+    """Clusters a batch of states on a QThreadPool thread and reports back via signals."""
+
+    def __init__(
+        self,
+        tasks: List[Tuple[str, str, int]],
+        n_init: int,
+        native_threads: int,
+        signals: _ClusterSignals,
+        executor: Any = None,
+    ) -> None:
+        super().__init__()
+        self.tasks = tasks
+        self.n_init = n_init
+        self.native_threads = native_threads
+        self.signals = signals
+        self.executor = executor
+
+    def run(self) -> None:
+        try:
+            if self.executor is not None:
+                # The worker process does the CSV parsing/writing outside this GIL
+                results = self.executor.submit(
+                    _cluster_batch_limited, self.tasks, self.n_init, self.native_threads
+                ).result()
+            else:
+                # In-process jobs share the limit ClusterTab set around the whole run
+                results = _cluster_batch(self.tasks, self.n_init)
+        except Exception as e:
+            results = [
+                (state, [f"State {state}: clustering failed: {e}"], False)
+                for state, _, _ in self.tasks
+            ]
+        for state, lines, ok in results:
+            self.signals.finished.emit(state, lines, ok)
+
+
+def _cluster_batch(
+    tasks: List[Tuple[str, str, int]], n_init: int
+) -> List[Tuple[str, List[str], bool]]:
+    """
+    Cluster a batch of states in the calling thread.
+
+    Args:
+        tasks: (state, geocoded.csv path, k) for each state in the batch.
+
+    Returns:
+        (state, log lines, clustered.csv written) for each task, in order.
+    """
+    results: List[Tuple[str, List[str], bool]] = []
+    for state, geo_csv, k in tasks:
+        lines: List[str] = []
+        ok = cluster_state_file(state, Path(geo_csv), k, lines.append, n_init)
+        results.append((state, lines, ok))
+    return results
+
+
+def _cluster_batch_limited(
+    tasks: List[Tuple[str, str, int]], n_init: int, native_threads: int
+) -> List[Tuple[str, List[str], bool]]:
+    """
+    Picklable entry point for clustering a batch in a worker process.
+
+    A loky worker runs one batch at a time, so the process-wide native
+    thread limit cannot interleave with another job's.
+    """
+    with _native_thread_limit(native_threads):
+        return _cluster_batch(tasks, n_init)
+
+
+def _process_executor(workers: int) -> Any:
+    """
+    Return joblib's reusable loky process pool, or None if joblib is unavailable.
+
+    joblib is installed with scikit-learn. Worker processes stay alive between
+    Cluster All runs, so only the first run pays their start-up and imports.
+    """
+    try:
+        from joblib.externals.loky import get_reusable_executor
+    except ImportError:
+        return None
+    return get_reusable_executor(max_workers=workers)
+
+
+def _native_thread_limit(threads: int) -> Any:
+    """
+    Cap BLAS and OpenMP threads used by numpy/scikit-learn inside the block.
+
+    Concurrent jobs would otherwise each start a full set of native threads
+    (KMeans parallelizes with OpenMP) and oversubscribe the cores.
+    threadpoolctl is installed with scikit-learn; without it this is a no-op.
+    The limit is process-wide, so enter it once per process, never per thread.
+    """
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return contextlib.nullcontext()
+    return threadpool_limits(limits=max(1, threads))
+
+
+class _CsvModel(QAbstractTableModel):
+    """
+    Read-only table model over a header and a list of string rows.
+
+    Columns whose leading values all parse as numbers (lat, lon,
+    cluster_id, ...) expose floats through EditRole, right-align and sort
+    numerically; cells are still displayed with the CSV's own text.
+    """
+
+    # Non-empty values sampled per column when detecting numeric columns
+    SNIFF_ROWS = 20
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._headers: List[str] = []
+        self._rows: List[List[str]] = []
+        self._numeric: List[bool] = []
+
+    def set_rows(self, headers: List[str], rows: List[List[str]]) -> None:
+        # One model reset replaces the whole preview
+        self.beginResetModel()
+        self._headers = headers
+        self._rows = rows
+        self._numeric = [self._sniff_numeric(c) for c in range(len(headers))]
+        self.endResetModel()
+
+    def _cell(self, row: List[str], col: int) -> str:
+        # Short rows (ragged CSV lines) show empty cells
+        return row[col] if col < len(row) else ""
+
+    def _sniff_numeric(self, col: int) -> bool:
+        sample = itertools.islice(
+            (v for v in (self._cell(r, col) for r in self._rows) if v), self.SNIFF_ROWS
+        )
+        seen = False
+        for value in sample:
+            try:
+                float(value)
+            except ValueError:
+                return False
+            seen = True
+        return seen
+
+    def _number(self, value: str) -> Optional[float]:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._cell(self._rows[index.row()], col)
+        if not self._numeric[col]:
+            return None
+        # Numbers are only parsed when Qt asks for them
+        if role == Qt.ItemDataRole.EditRole:
+            return self._number(self._cell(self._rows[index.row()], col))
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        if not 0 <= column < len(self._headers):
+            return
+        if self._numeric[column]:
+            # Numeric columns compare as floats; empty or unparsable cells sort last
+            def key(row: List[str]) -> Tuple[bool, Any]:
+                number = self._number(self._cell(row, column))
+                return (number is None, number or 0.0)
+
+        else:
+
+            def key(row: List[str]) -> Tuple[bool, Any]:
+                return (False, self._cell(row, column))
+
+        self.layoutAboutToBeChanged.emit()
+        self._rows.sort(key=key, reverse=order == Qt.SortOrder.DescendingOrder)
+        self.layoutChanged.emit()
+
+    def headerData(
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return section + 1
+
 
 class ClusterTab(QWidget):
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self.setObjectName("ClusterTab")
         self.workspace: Optional[Path] = None
+        # State name -> folder, from the last scan of the workspace root
+        self._state_dirs: Dict[str, Path] = {}
+        _start_import_warmup()
+
+        # Cluster All runs states on a pool owned by this tab, so resizing it never
+        # affects other users of the global pool; results come back through these signals
+        self._cluster_pool = QThreadPool(self)
+        self._cluster_signals = _ClusterSignals(self)
+        self._cluster_signals.finished.connect(self._on_cluster_job_finished)
+        self._pending_jobs = 0
+        # Native thread limit held for a whole in-process Cluster All run
+        self._thread_limit = contextlib.ExitStack()
+
+        # Log lines are batched and written to the QTextEdit at most every 50 ms
+        self._log_buf: List[str] = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+
+        # Debounces on_state_selected so holding an arrow key loads one preview
+        self._pending_state = ""
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(150)
+        self._reload_timer.timeout.connect(self._do_reload)
+
+        # Parsed cluster_prefs.json, keyed by (path, mtime_ns, size) so it is only
+        # re-read when the file changes on disk
+        self._prefs_cache: Optional[Dict[str, Any]] = None
+        self._prefs_key: Optional[Tuple[Path, int, int]] = None
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
@@ -78,6 +748,7 @@ class ClusterTab(QWidget):
         # Update workspace and clear logs to avoid mixing scenarios
         self.workspace = Path(path_str) if path_str else None
         if hasattr(self, "log"):
+            self._log_buf.clear()
             self.log.clear()
         if hasattr(self, "banner"):
             self.banner.setText(f"Workspace: {path_str}" if path_str else "Workspace: (none)")
@@ -98,6 +769,9 @@ class ClusterTab(QWidget):
         if not state:
             QMessageBox.information(self, "Select a state", "Please select a state to cluster.")
             return
+        if self._pending_jobs:
+            self.log_append("Clustering is already running.")
+            return
         k = int(self.k_clusters.value())
         self._cluster_state(state, k)
 
@@ -110,21 +784,72 @@ class ClusterTab(QWidget):
         if count == 0:
             QMessageBox.information(self, "No states", "No states found to cluster.")
             return
+        if self._pending_jobs:
+            self.log_append("Clustering is already running.")
+            return
         k = int(self.k_clusters.value())
         states: List[str] = [self.state_list.item(i).text() for i in range(count)]
         self.log_append(f"Clustering ALL states ({len(states)}) with k={k}…")
+        # States are independent, so each one runs as its own job; the cores left
+        # over are shared out as native threads inside each fit. Jobs hand the work
+        # to worker processes when there is more than one state to overlap
+        cpus = os.cpu_count() or 1
+        pool_size = max(1, min(cpus, len(states)))
+        native_threads = max(1, cpus // pool_size)
+        executor = _process_executor(pool_size) if pool_size > 1 else None
+        n_init = self._get_n_init()
+        if executor is None:
+            # Jobs run as threads of this process: apply the limit once, around the run
+            self._thread_limit.enter_context(_native_thread_limit(native_threads))
+        self._cluster_pool.setMaxThreadCount(pool_size)
+        self._set_cluster_buttons_enabled(False)
+        self._pending_jobs = len(states)
+        tasks: List[Tuple[str, str, int]] = []
         for st in states:
-            self._cluster_state(st, k)
+            k_state = self._resolve_state_k(st, k)
+            self.log_append(f"Clustering state {st} with k={k_state}…")
+            tasks.append((st, str(self._state_dir(st) / "geocoded.csv"), k_state))
+        # With many more states than workers, send several per job so per-task
+        # dispatch is amortized, while keeping ~JOBS_PER_WORKER jobs per worker
+        # so uneven state sizes still balance out
+        batch = max(1, -(-len(tasks) // (pool_size * JOBS_PER_WORKER)))
+        for i in range(0, len(tasks), batch):
+            job = _ClusterJob(
+                tasks[i : i + batch], n_init, native_threads, self._cluster_signals, executor
+            )
+            self._cluster_pool.start(job)
+
+    def _on_cluster_job_finished(self, state: str, lines: List[str], ok: bool) -> None:
+        # Runs on the GUI thread for each finished _ClusterJob
+        for line in lines:
+            self.log_append(line)
+        if ok:
+            self._refresh_preview_if_current(state)
+        self._pending_jobs -= 1
+        if self._pending_jobs == 0:
+            self._thread_limit.close()
+            self.log_append("Clustering ALL states finished.")
+            self._set_cluster_buttons_enabled(True)
+
+    def _set_cluster_buttons_enabled(self, enabled: bool) -> None:
+        self.cluster_all_btn.setEnabled(enabled and self.state_list.count() > 0)
+        self.cluster_btn.setEnabled(enabled and self.state_list.currentItem() is not None)
 
     def log_append(self, msg: str) -> None:
-        self.log.append(msg)
+        # Buffered; _flush_log appends everything queued within one timer tick
+        self._log_buf.append(msg)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self) -> None:
+        if not self._log_buf:
+            return
+        self.log.append("\n".join(self._log_buf))
+        self._log_buf.clear()
         self.log.moveCursor(QTextCursor.MoveOperation.End)
         self.log.ensureCursorVisible()
 
-    def _cluster_state(self, state: str, k: int) -> None:
-        # Internal helper to cluster a single state and update preview/logs
-        if not self.workspace:
-            return
+    def _resolve_state_k(self, state: str, k: int) -> int:
         # Apply per-state override if available
         try:
             k_pref = self._get_state_k(state)
@@ -132,89 +857,24 @@ class ClusterTab(QWidget):
                 k = int(k_pref)
         except Exception:
             pass
+        return k
+
+    def _cluster_state(self, state: str, k: int) -> None:
+        # Internal helper to cluster a single state and update preview/logs
+        if not self.workspace:
+            return
+        k = self._resolve_state_k(state, k)
         self.log_append(f"Clustering state {state} with k={k}…")
-        state_dir = self.workspace / state
+        state_dir = self._state_dir(state)
         geo_csv = state_dir / "geocoded.csv"
-        out_csv = state_dir / "clustered.csv"
-        if not geo_csv.exists():
-            self.log_append(f"State {state}: geocoded.csv not found at {geo_csv}")
-            return
-        try:
-            import pandas as pd
-        except Exception as e:
-            self.log_append(f"Pandas not available: {e}")
-            return
-        try:
-            from sklearn.cluster import KMeans
-        except Exception as e:
-            self.log_append(f"scikit-learn not available: {e}")
-            return
-        try:
-            df = pd.read_csv(geo_csv)
-        except Exception as e:
-            self.log_append(f"Failed reading {geo_csv}: {e}")
-            return
-        cols = {c.lower(): c for c in df.columns}
-        lat_col = cols.get("lat") or cols.get("latitude")
-        lon_col = cols.get("lon") or cols.get("longitude")
-        if not lat_col or not lon_col:
-            self.log_append(
-                "Could not find latitude/longitude columns (lat/lon or latitude/longitude)."
-            )
-            return
-        try:
-            X = df[[lat_col, lon_col]].to_numpy()
-            if len(X) == 0:
-                self.log_append(f"State {state}: no rows to cluster.")
-                return
-            # Ensure k does not exceed the number of unique coordinate pairs to avoid ConvergenceWarning
-            try:
-                import numpy as np
-            except Exception as e:
-                self.log_append(f"NumPy not available: {e}")
-                return
-            n_unique = int(np.unique(X, axis=0).shape[0])
-            if n_unique == 0:
-                self.log_append(f"State {state}: no unique coordinate rows to cluster.")
-                return
-            k_eff = max(1, min(k, len(X), n_unique))
-            if k_eff != k:
-                self.log_append(
-                    f"State {state}: adjusted k from {k} to {k_eff} due to {n_unique} unique points."
-                )
-            model = KMeans(n_clusters=k_eff, n_init="auto", random_state=42)
-            labels = model.fit_predict(X)
-            df["cluster_id"] = labels
-            df.to_csv(out_csv, index=False)
-            self.log_append(
-                f"State {state}: wrote clustered.csv with {k_eff} clusters -> {out_csv}"
-            )
-            # Log quick stats: min/median/max cluster sizes and % singletons
-            try:
-                sizes = df["cluster_id"].value_counts().tolist()
-                if sizes:
-                    sizes_sorted = sorted(sizes)
-                    n = len(sizes_sorted)
-                    median = (
-                        sizes_sorted[n // 2]
-                        if n % 2 == 1
-                        else ((sizes_sorted[n // 2 - 1] + sizes_sorted[n // 2]) / 2)
-                    )
-                    singletons = sum(1 for s in sizes_sorted if s == 1)
-                    pct_single = 100.0 * singletons / max(1, n)
-                    self.log_append(
-                        f"State {state}: cluster sizes min/median/max = "
-                        f"{sizes_sorted[0]}/{median}/{sizes_sorted[-1]} | "
-                        f"{singletons} singleton clusters ({pct_single:.1f}%)."
-                    )
-            except Exception:
-                pass
-            # If the state is currently selected, refresh preview; otherwise leave table as-is
-            current = self.state_list.currentItem().text() if self.state_list.currentItem() else ""
-            if current == state:
-                self._load_table_from_csv(out_csv)
-        except Exception as e:
-            self.log_append(f"State {state}: clustering failed: {e}")
+        if cluster_state_file(state, geo_csv, k, self.log_append, self._get_n_init()):
+            self._refresh_preview_if_current(state)
+
+    def _refresh_preview_if_current(self, state: str) -> None:
+        # If the state is currently selected, refresh preview; otherwise leave table as-is
+        current = self.state_list.currentItem().text() if self.state_list.currentItem() else ""
+        if current == state and self.workspace:
+            self._load_table_from_csv(self._state_dir(state) / "clustered.csv")
 
     # --- View tab helpers ---
     def _init_view_tab(self, container: QWidget) -> None:
@@ -271,10 +931,14 @@ class ClusterTab(QWidget):
         right_box = QVBoxLayout()
         right_label = QLabel("clustered.csv preview")
         right_label.setStyleSheet("font-weight: 600;")
-        self.table = QTableWidget()
+        # Model/view: cells are served from plain lists, no per-cell item objects
+        self.table = QTableView()
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.table.setColumnCount(0)
-        self.table.setRowCount(0)
+        self._table_model = _CsvModel(self.table)
+        self.table.setModel(self._table_model)
+        # No initial sort: rows keep file order until a header is clicked
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
         right_box.addWidget(right_label)
         right_box.addWidget(self.table, 1)
 
@@ -292,31 +956,45 @@ class ClusterTab(QWidget):
         if not hasattr(self, "state_list"):
             return
         self.state_list.clear()
-        if not self.workspace or not self.workspace.exists():
+        self._state_dirs = {}
+        if not self.workspace:
             return
         # List subdirectories at workspace root as potential state folders
         try:
-            added = 0
-            for p in sorted([d for d in self.workspace.iterdir() if d.is_dir()]):
-                # Skip hidden folders like .cache
-                if p.name.startswith("."):
-                    continue
-                self.state_list.addItem(p.name)
-                added += 1
+            # Skip hidden folders like .cache
+            names = subdir_names(self.workspace, skip_hidden=True)
+            self._state_dirs = {name: self.workspace / name for name in names}
+            self.state_list.addItems(names)
             if hasattr(self, "cluster_all_btn"):
-                self.cluster_all_btn.setEnabled(added > 0)
+                self.cluster_all_btn.setEnabled(len(names) > 0)
+        except FileNotFoundError:
+            return
         except Exception as e:
             self.log_append(f"Failed to list states in {self.workspace}: {e}")
 
+    def _state_dir(self, state: str) -> Path:
+        # Folder of a listed state; falls back to joining for states added since the scan
+        return self._state_dirs.get(state) or self.workspace / state
+
     def on_state_selected(self, state_code: str) -> None:
         # Enable cluster when a state is selected
         if hasattr(self, "cluster_btn"):
             self.cluster_btn.setEnabled(bool(state_code))
         # Try to load clustered.csv if present; otherwise clear table
         if not self.workspace or not state_code:
+            self._reload_timer.stop()
             self.clear_table()
             return
-        csv_path = self.workspace / state_code / "clustered.csv"
+        # Coalesce rapid arrow-key navigation: only the last selection is loaded
+        self._pending_state = state_code
+        self._reload_timer.start()
+
+    def _do_reload(self) -> None:
+        state_code = self._pending_state
+        current = self.state_list.currentItem().text() if self.state_list.currentItem() else ""
+        if not self.workspace or not state_code or state_code != current:
+            return
+        csv_path = self._state_dir(state_code) / "clustered.csv"
         if csv_path.exists():
             self._load_table_from_csv(csv_path)
             if hasattr(self, "preview_map_btn"):
@@ -335,31 +1013,41 @@ class ClusterTab(QWidget):
 
     def clear_table(self) -> None:
         if hasattr(self, "table"):
-            self.table.clear()
-            self.table.setColumnCount(0)
-            self.table.setRowCount(0)
+            self._table_model.set_rows([], [])
+
+    def _read_preview_sidecar(self, csv_path: Path) -> Optional[List[List[str]]]:
+        # Header + first PREVIEW_ROWS rows from clustered.parquet, if it is current
+        sidecar = csv_path.with_suffix(".parquet")
+        try:
+            if not _has_pyarrow() or sidecar.stat().st_mtime < csv_path.stat().st_mtime:
+                return None
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(sidecar, memory_map=True).slice(0, PREVIEW_ROWS)
+        except Exception:
+            return None
+        # Values are stored as the CSV's own text, so no formatting is needed
+        columns = [col.to_pylist() for col in table.columns]
+        return [table.column_names] + [list(row) for row in zip(*columns)]
 
     def _load_table_from_csv(self, csv_path: Path) -> None:
         # Lightweight CSV preview without pandas to avoid duplication
-        try:
-            with csv_path.open("r", newline="", encoding="utf-8") as f:
-                reader = csv.reader(f)
-                rows: List[List[str]] = [row for row in reader]
-        except Exception as e:
-            self.log_append(f"Failed reading {csv_path}: {e}")
-            return
+        rows = self._read_preview_sidecar(csv_path)
+        if rows is None:
+            try:
+                with csv_path.open("r", newline="", encoding="utf-8") as f:
+                    # Header plus the visible rows only; the rest of the file is never parsed
+                    rows = list(itertools.islice(csv.reader(f), PREVIEW_ROWS + 1))
+            except Exception as e:
+                self.log_append(f"Failed reading {csv_path}: {e}")
+                return
         if not rows:
             self.clear_table()
             return
+        # Both sources are already capped at PREVIEW_ROWS data rows
         headers = rows[0]
         data = rows[1:]
-        self.table.clear()
-        self.table.setColumnCount(len(headers))
-        self.table.setRowCount(min(len(data), 1000))  # cap preview rows
-        self.table.setHorizontalHeaderLabels(headers)
-        for r, row in enumerate(data[:1000]):
-            for c, val in enumerate(row):
-                self.table.setItem(r, c, QTableWidgetItem(val))
+        self._table_model.set_rows(headers, data)
 
     # --- Preferences helpers: per-state K overrides ---
 
@@ -369,23 +1057,19 @@ class ClusterTab(QWidget):
         if not self.workspace or not state:
             QMessageBox.information(self, "Select a state", "Select a state to analyze.")
             return
-        geo_csv = self.workspace / state / "geocoded.csv"
+        geo_csv = self._state_dir(state) / "geocoded.csv"
         if not geo_csv.exists():
             QMessageBox.information(self, "No geocoded.csv", "Geocode first, then try Auto K.")
             return
         try:
-            import numpy as np  # type: ignore
-            import pandas as pd  # type: ignore
-            from sklearn.cluster import KMeans  # type: ignore
+            pd, np, skcluster = _lazy_deps()
             from sklearn.metrics import silhouette_score  # type: ignore
         except Exception as e:
             self.log_append(f"Auto K requires pandas, scikit-learn, numpy: {e}")
             return
         try:
             df = pd.read_csv(geo_csv)
-            cols = {c.lower(): c for c in df.columns}
-            lat_col = cols.get("lat") or cols.get("latitude")
-            lon_col = cols.get("lon") or cols.get("longitude")
+            lat_col, lon_col = _latlon_columns(tuple(df.columns))
             if not lat_col or not lon_col:
                 self.log_append("Auto K: lat/lon columns not found.")
                 return
@@ -393,7 +1077,7 @@ class ClusterTab(QWidget):
             if len(X) < 3:
                 self.log_append("Auto K: need at least 3 points.")
                 return
-            n_unique = int(np.unique(X, axis=0).shape[0])
+            n_unique = int(np.unique(_row_keys(np, X)).size)
             if n_unique < 3:
                 self.log_append("Auto K: fewer than 3 unique points; suggesting K=1.")
                 self.k_clusters.setValue(1)
@@ -404,7 +1088,9 @@ class ClusterTab(QWidget):
             best_score = -1.0
             for k in range(k_min, k_max + 1):
                 try:
-                    labels = KMeans(n_clusters=k, n_init="auto", random_state=42).fit_predict(X)
+                    labels = skcluster.KMeans(
+                        n_clusters=k, n_init="auto", random_state=42
+                    ).fit_predict(X)
                     # Silhouette is undefined for single-label; guard by design with k>=2
                     score = silhouette_score(X, labels)
                     if score > best_score:
@@ -428,14 +1114,14 @@ class ClusterTab(QWidget):
         if not self.workspace or not state:
             QMessageBox.information(self, "Select a state", "Select a state to preview.")
             return
-        csv_path = self.workspace / state / "clustered.csv"
+        csv_path = self._state_dir(state) / "clustered.csv"
         if not csv_path.exists():
             QMessageBox.information(
                 self, "No clustered.csv", "Run clustering first to preview the map."
             )
             return
         try:
-            import pandas as pd  # type: ignore
+            pd, np, _ = _lazy_deps()
         except Exception:
             self.log_append("pandas is required for map preview. Install with: uv add pandas")
             return
@@ -446,42 +1132,44 @@ class ClusterTab(QWidget):
             return
         try:
             df = pd.read_csv(csv_path)
-            cols = {c.lower(): c for c in df.columns}
-            lat_col = cols.get("lat") or cols.get("latitude")
-            lon_col = cols.get("lon") or cols.get("longitude")
-            cid_col = cols.get("cluster_id")
+            lat_col, lon_col = _latlon_columns(tuple(df.columns))
+            cid_col = next((c for c in df.columns if c.lower() == "cluster_id"), None)
             if not lat_col or not lon_col or not cid_col:
                 self.log_append("clustered.csv must include lat/lon and cluster_id columns.")
                 return
-            if df.empty:
+            lat = pd.to_numeric(df[lat_col], errors="coerce").to_numpy(dtype=float)
+            lon = pd.to_numeric(df[lon_col], errors="coerce").to_numpy(dtype=float)
+            cid = pd.to_numeric(df[cid_col], errors="coerce").to_numpy(dtype=float)
+            # Drop rows with missing/unparseable values up front instead of per row
+            mask = np.isfinite(lat) & np.isfinite(lon) & np.isfinite(cid)
+            lat, lon, cid = lat[mask], lon[mask], cid[mask].astype(np.int64)
+            if lat.size == 0:
                 self.log_append("No rows to preview on the map.")
                 return
-            center = [df[lat_col].astype(float).mean(), df[lon_col].astype(float).mean()]
+            center = [float(lat.mean()), float(lon.mean())]
             m = folium.Map(location=center, zoom_start=7)
-            palette = [
-                "#1f77b4",
-                "#ff7f0e",
-                "#2ca02c",
-                "#d62728",
-                "#9467bd",
-                "#8c564b",
-                "#e377c2",
-                "#7f7f7f",
-                "#bcbd22",
-                "#17becf",
+            # One style per cluster, built up front; features only carry their cid
+            n_colors = len(MAP_PALETTE)
+            styles = {
+                c: {"color": MAP_PALETTE[c % n_colors], "fillOpacity": 0.8}
+                for c in np.unique(cid).tolist()
+            }
+            # One GeoJSON layer carries every point, instead of one map child (and one
+            # block of generated JS) per CircleMarker
+            features = [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [lo, la]},
+                    "properties": {"cid": c},
+                }
+                for la, lo, c in zip(lat.tolist(), lon.tolist(), cid.tolist())
             ]
-            for _, r in df.iterrows():
-                try:
-                    lat = float(r[lat_col])
-                    lon = float(r[lon_col])
-                    cid = int(r[cid_col])
-                except Exception:
-                    continue
-                color = palette[cid % len(palette)]
-                folium.CircleMarker(
-                    location=[lat, lon], radius=3, color=color, fill=True, fill_opacity=0.8
-                ).add_to(m)
-            out_html = self.workspace / state / "cluster_preview.html"
+            folium.GeoJson(
+                {"type": "FeatureCollection", "features": features},
+                marker=folium.CircleMarker(radius=3, fill=True),
+                style_function=lambda f: styles[f["properties"]["cid"]],
+            ).add_to(m)
+            out_html = self._state_dir(state) / "cluster_preview.html"
             m.save(str(out_html))
             try:
                 webbrowser.open(out_html.as_uri())
@@ -498,28 +1186,37 @@ class ClusterTab(QWidget):
 
     def _load_prefs(self) -> Dict[str, Any]:
         p = self._prefs_path()
-        if not p or not p.exists():
+        if not p:
             return {}
         try:
-            import json
-
-            with p.open("r", encoding="utf-8") as f:
-                return json.load(f) or {}
-        except Exception:
+            st = p.stat()
+        except OSError:
             return {}
+        key = (p, st.st_mtime_ns, st.st_size)
+        if key != self._prefs_key:
+            try:
+                with p.open("r", encoding="utf-8") as f:
+                    self._prefs_cache = json.load(f) or {}
+            except Exception:
+                self._prefs_cache = {}
+            self._prefs_key = key
+        # Callers modify what they get back before saving, so hand out a copy
+        return copy.deepcopy(self._prefs_cache or {})
 
     def _save_prefs(self, data: Dict[str, Any]) -> None:
         p = self._prefs_path()
         if not p:
             return
+        tmp = p.with_suffix(".json.tmp")
         try:
-            import json
-
             p.parent.mkdir(parents=True, exist_ok=True)
-            with p.open("w", encoding="utf-8") as f:
+            # Write aside and swap in, so a crash never leaves a truncated prefs file
+            with tmp.open("w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2)
+            os.replace(tmp, p)
         except Exception:
-            pass
+            tmp.unlink(missing_ok=True)
+        self._prefs_key = None
 
     def _get_state_k(self, state: str) -> Optional[int]:
         prefs = self._load_prefs()
@@ -529,6 +1226,13 @@ class ClusterTab(QWidget):
         except Exception:
             return None
 
+    def _get_n_init(self) -> int:
+        # Optional "n_init" in cluster_prefs.json; k-means++ restarts per state fit
+        try:
+            return max(1, int(self._load_prefs().get("n_init", 1)))
+        except Exception:
+            return 1
+
     def _set_state_k(self, state: str, k: int) -> None:
         prefs = self._load_prefs()
         per = prefs.get("per_state_k") or {}
@@ -1,14 +1,28 @@
 from __future__ import annotations
 
 import csv
+import functools
+import itertools
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from PyQt6.QtCore import QMetaObject, QObject, QSettings, Qt, QThread, pyqtSignal, pyqtSlot
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import (
+    QAbstractTableModel,
+    QMetaObject,
+    QModelIndex,
+    QObject,
+    QSettings,
+    Qt,
+    QThread,
+    pyqtSignal,
+    pyqtSlot,
+)
 from PyQt6.QtGui import QAction, QTextCursor
 from PyQt6.QtWidgets import (
     QDialog,
+    QDoubleSpinBox,
     QFormLayout,
     QHBoxLayout,
     QHeaderView,
@@ -20,15 +34,116 @@ from PyQt6.QtWidgets import (
     QProgressBar,
     QPushButton,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QSpinBox,
+    QTableView,
     QTabWidget,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
-from app.geocoding import GeocodingCache, GeocodingStrategy
+from app.geocoding import Geocoder, GeocodingCache, GeocodingStrategy
+from app.geocoding.nominatim import PUBLIC_SEARCH_URL
+from app.geocoding.runner import MAX_WORKERS
+from app.tabs.workspace_tab import subdir_names
+
+# Default spacing between requests to a self-hosted Nominatim (matches the public policy)
+DEFAULT_MIN_INTERVAL = 1.05
+
+# Worker log lines are sent to the UI in batches (whichever limit is hit first)
+LOG_FLUSH_LINES = 50
+LOG_FLUSH_SECONDS = 0.25
+# Minimum spacing of progress updates (~20 Hz)
+PROGRESS_INTERVAL = 0.05
+
+# addresses.csv columns read by the worker, in unpacking order
+ADDRESS_FIELDS = ("id", "address", "city", "state", "zip")
+
+# Full names for territory/district codes, used as an extra fallback query
+_TERRITORY_NAMES = {
+    "PR": "Puerto Rico",
+    "GU": "Guam",
+    "VI": "U.S. Virgin Islands",
+    "MP": "Northern Mariana Islands",
+    "AS": "American Samoa",
+    "DC": "District of Columbia",
+}
+
+
+# Read size for newline counting
+COUNT_CHUNK = 1 << 20
+
+
+def _count_rows(path: Path) -> int:
+    """Count data rows in a CSV from its newline count, without parsing it."""
+    lines = 0
+    last = b"\n"
+    with open(path, "rb", buffering=0) as f:
+        # bytes.count is a C scan; no decoding or per-line objects
+        while chunk := f.read(COUNT_CHUNK):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        # Final line without a trailing newline
+        lines += 1
+    return max(0, lines - 1)
+
+
+def _count_geocoded(path: Path) -> int:
+    """Count rows of a geocoded.csv that have both lat and lon."""
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.compute as pc  # type: ignore
+        import pyarrow.csv as pacsv  # type: ignore
+    except ImportError:
+        return _count_geocoded_csv(path)
+
+    with path.open("r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f), [])
+    if "lat" not in header or "lon" not in header:
+        return 0
+    # Only the two columns are converted, as strings, by the multithreaded C++ reader
+    try:
+        table = pacsv.read_csv(
+            path,
+            convert_options=pacsv.ConvertOptions(
+                include_columns=["lat", "lon"],
+                column_types={"lat": pa.string(), "lon": pa.string()},
+            ),
+        )
+    except (pa.ArrowInvalid, OSError):
+        # Ragged rows or an undecodable file: the csv module is more lenient
+        return _count_geocoded_csv(path)
+    if table.num_rows == 0:
+        return 0
+    filled = [pc.not_equal(pc.utf8_trim_whitespace(table[c]), "") for c in ("lat", "lon")]
+    return int(pc.sum(pc.and_(*filled)).as_py())
+
+
+def _count_geocoded_csv(path: Path) -> int:
+    with path.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if "lat" not in header or "lon" not in header:
+            return 0
+        # Quoted addresses contain commas, so rows are still tokenized, but as plain lists
+        lat_i, lon_i = header.index("lat"), header.index("lon")
+        width = max(lat_i, lon_i) + 1
+        return sum(
+            1 for row in reader if len(row) >= width and row[lat_i].strip() and row[lon_i].strip()
+        )
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_count(counter: Callable[[Path], int], path: str, mtime_ns: int, size: int) -> int:
+    # Keyed by the file's stat: a rewritten file misses, an unchanged one costs no reading
+    return counter(Path(path))
+
+
+def _count_if_changed(counter: Callable[[Path], int], path: Path) -> int:
+    """Run a row counter on path, reusing the last result while the file is unchanged."""
+    st = path.stat()
+    return _cached_count(counter, str(path), st.st_mtime_ns, st.st_size)
 
 
 class ClearCacheConfirmationDialog(QDialog):
@@ -140,13 +255,29 @@ class GeocodeWorker(QObject):
         int, int, int, int
     )  # total_lookups, cache_hits, new_geocoded, total_errors
 
-    def __init__(self, workspace: Path, states: List[str], strategy: GeocodingStrategy) -> None:
+    def __init__(
+        self,
+        workspace: Path,
+        states: List[str],
+        strategy: GeocodingStrategy,
+        max_workers: Optional[int] = None,
+        verbose: bool = False,
+    ) -> None:
         super().__init__()
         self.workspace = workspace
         self.states = states
         self.strategy = strategy
+        # Requests in flight at once; None sizes the pool from the strategy's rate limit
+        self.max_workers = max_workers
+        # Log every cache hit individually instead of one summary line per state
+        self.verbose = verbose
         self._cancel = False
         self.cache = GeocodingCache()
+        # Buffered log lines; the strategy logger appends from pool threads
+        self._log_lines: List[str] = []
+        self._log_lock = threading.Lock()
+        self._log_flushed = time.monotonic()
+        self._progress_sent = 0.0
 
     @pyqtSlot()
     def request_cancel(self) -> None:
@@ -155,28 +286,47 @@ class GeocodeWorker(QObject):
         self._cancel = True
 
     # --- Worker-local helpers (no UI calls) ---
+    def _log(self, msg: str) -> None:
+        # Each emit is a cross-thread event and a QTextEdit append; send lines in batches
+        with self._log_lock:
+            self._log_lines.append(msg)
+            due = (
+                len(self._log_lines) >= LOG_FLUSH_LINES
+                or time.monotonic() - self._log_flushed >= LOG_FLUSH_SECONDS
+            )
+        if due:
+            self._flush_log()
+
+    def _flush_log(self) -> None:
+        with self._log_lock:
+            lines, self._log_lines = self._log_lines, []
+            self._log_flushed = time.monotonic()
+        if lines:
+            self.log.emit("\n".join(lines))
+
+    def _emit_progress(self, processed: int, total: int, force: bool = False) -> None:
+        now = time.monotonic()
+        if force or processed >= total or now - self._progress_sent >= PROGRESS_INTERVAL:
+            self._progress_sent = now
+            self.progress.emit(processed, total)
+
     @staticmethod
     def _territory_full_name(code: str) -> Optional[str]:
-        mapping = {
-            "PR": "Puerto Rico",
-            "GU": "Guam",
-            "VI": "U.S. Virgin Islands",
-            "MP": "Northern Mariana Islands",
-            "AS": "American Samoa",
-            "DC": "District of Columbia",
-        }
-        return mapping.get(code.upper())
-
-    def _geocode(self, query: str) -> Optional[Dict[str, Any]]:
-        """Geocode a query using the configured strategy.
-
-        Args:
-            query: Address string to geocode
-
-        Returns:
-            Dictionary with 'lat', 'lon', 'display_name' if successful, None otherwise
-        """
-        return self.strategy.geocode(query)
+        return _TERRITORY_NAMES.get(code.upper())
+
+    def _fallback_queries(
+        self, norm: str, address: str, city: str, st: str, zip5: str
+    ) -> List[Tuple[str, str]]:
+        # multi-strategy: most precise query first, coarse city/state centroid last
+        strategies = [(norm, "full")]
+        no_zip = ", ".join([address, city, st, "USA"])
+        if zip5:
+            strategies.append((no_zip, "no-zip"))
+        terr = self._territory_full_name(st)
+        if terr:
+            strategies.append((", ".join([address, city, terr]), "territory"))
+        strategies.append((f"{city}, {st}", "city-state"))
+        return strategies
 
     def run(self) -> None:
         # Geocode states; emit signals instead of touching UI
@@ -188,176 +338,200 @@ class GeocodeWorker(QObject):
         # Set up strategy logger to emit diagnostic messages
         # Check if strategy has a logger attribute (NominatimStrategy does)
         if hasattr(self.strategy, "logger"):
-            self.strategy.logger = lambda msg: self.log.emit(f"[Strategy] {msg}")
+            self.strategy.logger = lambda msg: self._log(f"[Strategy] {msg}")
 
-        self.log.emit(f"Using cache: {self.cache.get_cache_path()}")
+        self._log(f"Using cache: {self.cache.get_cache_path()}")
+        geocoder = Geocoder(self.strategy, self.cache, max_workers=self.max_workers)
         total_lookups = 0
         total_cache_hits = 0
         total_geocoded = 0
         total_errors = 0
+        failed_states = 0
 
-        # Pre-read rows to know grand total
-        state_rows: Dict[str, List[Dict[str, str]]] = {}
-        for state in self.states:
-            addr_csv = self.workspace / state / "addresses.csv"
-            if not addr_csv.exists():
-                continue
-            try:
-                rows: List[Dict[str, str]] = []
-                with addr_csv.open("r", encoding="utf-8", newline="") as f:
-                    reader = csv.DictReader(f)
-                    for r in reader:
-                        rows.append(r)
-                state_rows[state] = rows
-            except Exception as e:
-                self.log.emit(f"Failed to read {addr_csv}: {e}")
-                continue
-
-        grand_total = sum(len(v) for v in state_rows.values())
         processed = 0
-        self.progress.emit(processed, grand_total)
-        cancelled = False
-        for state in self.states:
-            if self._cancel:
-                self.log.emit("Cancellation requested; stopping before next state…")
-                cancelled = True
-                break
-            rows = state_rows.get(state, [])
-            if not rows:
-                continue
-            self.log.emit(f"State {state}: reading {self.workspace / state / 'addresses.csv'}")
-            out_rows: List[Dict[str, Any]] = []
-            error_rows: List[Dict[str, Any]] = []
-            for i, r in enumerate(rows, start=1):
+        grand_total = 0
+        # Cleanup and finished must run even if a state raises outside its own handlers,
+        # or pool threads and SQLite connections stay open and the tab never re-enables
+        try:
+            # Estimate the grand total from line counts; each state is parsed only when
+            # reached, and its estimate is then replaced by the rows actually parsed
+            state_counts: Dict[str, int] = {}
+            for state in self.states:
+                addr_csv = self.workspace / state / "addresses.csv"
+                if not addr_csv.exists():
+                    continue
+                try:
+                    state_counts[state] = _count_rows(addr_csv)
+                except OSError as e:
+                    self._log(f"Failed to read {addr_csv}: {e}")
+                    continue
+
+            grand_total = sum(state_counts.values())
+            self._emit_progress(processed, grand_total, force=True)
+            cancelled = False
+            for state in self.states:
                 if self._cancel:
-                    self.log.emit("Cancellation requested; finishing current row and stopping…")
+                    self._log("Cancellation requested; stopping before next state…")
                     cancelled = True
                     break
-                site_id = str(r.get("id", "")).strip()
-                address = str(r.get("address", "")).strip()
-                city = str(r.get("city", "")).strip()
-                st = str(r.get("state", "")).strip()
-                zip5 = str(r.get("zip", "")).strip()
-                if not (address and city and st and zip5):
-                    # Track addresses with missing required fields
-                    error_rows.append(
-                        {
-                            "id": site_id,
-                            "address": address,
-                            "city": city,
-                            "state": st,
-                            "zip": zip5,
-                            "normalized_address": "",
-                            "strategy": self.strategy.get_source_name(),
-                            "reason": "missing_fields",
-                            "attempted_queries": 0,
-                        }
-                    )
-                    total_errors += 1
-                    processed += 1
-                    self.progress.emit(processed, grand_total)
+                # Upper bound: every record takes at least one line
+                row_count = state_counts.get(state, 0)
+                if not row_count:
                     continue
-                norm = GeocodingCache.normalize_address(address, city, st, zip5)
-                total_lookups += 1
-                cached = self.cache.get(norm)
-                if cached:
-                    total_cache_hits += 1
-                    lat = cached["lat"]
-                    lon = cached["lon"]
-                    disp = cached["display_name"]
-                    if lat is not None and lon is not None:
-                        # Successful cached result - add to output
-                        source = "cache"
-                        out_rows.append(
-                            {
-                                "id": site_id,
-                                "address": norm,
-                                "lat": lat,
-                                "lon": lon,
-                                "display_name": disp,
-                            }
-                        )
-                        self.log.emit(
-                            f"State {state}: [{i}/{len(rows)}] {site_id} -> {lat:.6f},{lon:.6f} (cache)"
-                        )
-                    else:
-                        # Cached failure - add to errors
-                        error_rows.append(
-                            {
-                                "id": site_id,
-                                "address": address,
-                                "city": city,
-                                "state": st,
-                                "zip": zip5,
-                                "normalized_address": norm,
-                                "strategy": self.strategy.get_source_name(),
-                                "reason": "cached_failure",
-                                "attempted_queries": 0,  # Already attempted previously
-                            }
-                        )
-                        total_errors += 1
-                        self.log.emit(
-                            f"State {state}: [{i}/{len(rows)}] {site_id} -> cached failure (previously failed)"
-                        )
-                    processed += 1
-                    self.progress.emit(processed, grand_total)
+                addr_csv = self.workspace / state / "addresses.csv"
+                self._log(f"State {state}: reading {addr_csv}")
+                error_rows: List[Dict[str, Any]] = []
+
+                # Stream rows into missing-field errors and lookups keyed by normalized address
+                lookups: List[Tuple[int, str, str, str, str, str, str]] = []
+                row_indexes: Dict[str, List[int]] = {}
+                fallbacks: Dict[str, List[Tuple[str, str]]] = {}
+                try:
+                    with addr_csv.open("r", encoding="utf-8", newline="") as f:
+                        reader = csv.reader(f)
+                        header = next(reader, [])
+                        # Column positions are resolved once; missing columns read as ""
+                        cols = [header.index(n) if n in header else -1 for n in ADDRESS_FIELDS]
+                        width = max(cols) + 1
+                        i = 0
+                        for row in reader:
+                            if not row:
+                                continue
+                            i += 1
+                            if len(row) < width:
+                                row += [""] * (width - len(row))
+                            site_id, address, city, st, zip5 = [
+                                row[c].strip() if c >= 0 else "" for c in cols
+                            ]
+                            if not (address and city and st and zip5):
+                                # Track addresses with missing required fields
+                                error_rows.append(
+                                    {
+                                        "id": site_id,
+                                        "address": address,
+                                        "city": city,
+                                        "state": st,
+                                        "zip": zip5,
+                                        "normalized_address": "",
+                                        "strategy": self.strategy.get_source_name(),
+                                        "reason": "missing_fields",
+                                        "attempted_queries": 0,
+                                    }
+                                )
+                                total_errors += 1
+                                processed += 1
+                                continue
+                            norm = GeocodingCache.normalize_address(address, city, st, zip5)
+                            lookups.append((i, site_id, address, city, st, zip5, norm))
+                            row_indexes.setdefault(norm, []).append(len(lookups) - 1)
+                            if norm not in fallbacks:
+                                fallbacks[norm] = self._fallback_queries(
+                                    norm, address, city, st, zip5
+                                )
+                except Exception as e:
+                    self._log(f"Failed to read {addr_csv}: {e}")
+                    # Drop the unreadable state from the totals as if it was never counted
+                    grand_total -= row_count
+                    processed -= len(error_rows)
+                    total_errors -= len(error_rows)
                     continue
-                else:
-                    rate_delay = self.strategy.get_rate_limit_delay()
-                    time.sleep(rate_delay)  # rate limit
-                    # multi-strategy
-                    strategies = [(norm, "full")]
-                    no_zip = ", ".join([address, city, st, "USA"])
-                    if zip5:
-                        strategies.append((no_zip, "no-zip"))
-                    terr = self._territory_full_name(st)
-                    if terr:
-                        strategies.append((", ".join([address, city, terr]), "territory"))
-                    strategies.append((f"{city}, {st}", "city-state"))
-                    got = None
-                    which = ""
-                    for q, label in strategies:
-                        if self._cancel:
-                            self.log.emit("Cancellation requested; breaking before geocode loop…")
-                            cancelled = True
-                            break
-                        res = self._geocode(q)
-                        if res:
-                            got = res
-                            which = label
-                            break
-                        # Check cancel again before sleeping to avoid delay
-                        if self._cancel:
-                            self.log.emit(
-                                "Cancellation requested; breaking before sleep to avoid delay…"
-                            )
-                            cancelled = True
-                            break
-                        time.sleep(rate_delay)
-                    if not got:
-                        # No geocoding result found - add to errors
-                        error_rows.append(
-                            {
-                                "id": site_id,
-                                "address": address,
-                                "city": city,
-                                "state": st,
-                                "zip": zip5,
-                                "normalized_address": norm,
-                                "strategy": self.strategy.get_source_name(),
-                                "reason": "no_result",
-                                "attempted_queries": len(strategies),
-                            }
-                        )
-                        total_errors += 1
-                        self.cache.put(norm, None, None, "", source="none")
-                        self.log.emit(
-                            f"State {state}: [{i}/{len(rows)}] {site_id} -> no result (tried {len(strategies)} queries)"
+                # Quoted newlines and blank lines inflate the line count; use the parsed rows
+                grand_total += i - row_count
+                row_count = i
+                self._emit_progress(processed, grand_total)
+                if not row_count:
+                    continue
+
+                cache_hit_rows = 0
+
+                def on_result(norm: str, res: Dict[str, Any]) -> None:
+                    # Live per-row log and progress as each address resolves
+                    nonlocal processed, cache_hit_rows
+                    if res["cached"] and not self.verbose:
+                        # Hits resolve locally in one batch; they are summarized after the state
+                        cache_hit_rows += len(row_indexes[norm])
+                        processed += len(row_indexes[norm])
+                        self._emit_progress(processed, grand_total)
+                        return
+                    for idx in row_indexes[norm]:
+                        i, site_id = lookups[idx][0], lookups[idx][1]
+                        prefix = f"State {state}: [{i}/{row_count}] {site_id} ->"
+                        if res["cached"]:
+                            if res["lat"] is not None and res["lon"] is not None:
+                                self._log(f"{prefix} {res['lat']:.6f},{res['lon']:.6f} (cache)")
+                            else:
+                                self._log(f"{prefix} cached failure (previously failed)")
+                        elif res["lat"] is None:
+                            self._log(f"{prefix} no result (tried {res['attempts']} queries)")
+                        elif res["label"] == "city-state":
+                            self._log(f"{prefix} coarse match skipped (city/state only)")
+                        else:
+                            source = f"{self.strategy.get_source_name()}:{res['label']}"
+                            self._log(f"{prefix} {res['lat']:.6f},{res['lon']:.6f} ({source})")
+                        processed += 1
+                    self._emit_progress(processed, grand_total)
+
+                try:
+                    # Coarse city/state centroids are reported but never cached
+                    results = geocoder.geocode_many(
+                        [lk[6] for lk in lookups],
+                        fallbacks=fallbacks,
+                        uncacheable_labels=("city-state",),
+                        should_cancel=lambda: self._cancel,
+                        on_result=on_result,
+                    )
+                except Exception as e:
+                    # Keep this state's previous output files and move on to the next state
+                    self._log(f"State {state}: geocoding failed, outputs left unchanged: {e}")
+                    failed_states += 1
+                    continue
+                if cache_hit_rows:
+                    self._log(f"State {state}: {cache_hit_rows} row(s) answered from cache")
+
+                # Stream results straight into geocoded.csv; only failures go to the errors file
+                rows_written = 0
+                try:
+                    out_dir = self.workspace / state
+                    out_dir.mkdir(parents=True, exist_ok=True)
+                    out_csv = out_dir / "geocoded.csv"
+                    with out_csv.open("w", encoding="utf-8", newline="") as f:
+                        writer = csv.DictWriter(
+                            f, fieldnames=["id", "address", "lat", "lon", "display_name"]
                         )
-                    else:
-                        # If match is coarse city/state centroid, do not cache/store lat/lon
-                        if which == "city-state":
-                            # Coarse match - add to errors
+                        writer.writeheader()
+                        for _, site_id, address, city, st, zip5, norm in lookups:
+                            res = results.get(norm)
+                            if res is None:
+                                # Not resolved: only happens when the run was cancelled
+                                if self._cancel:
+                                    cancelled = True
+                                continue
+                            total_lookups += 1
+                            if res["cached"]:
+                                total_cache_hits += 1
+                            lat = res["lat"]
+                            lon = res["lon"]
+                            if lat is not None and lon is not None and res["label"] != "city-state":
+                                # Success (fresh or cached) - write to output
+                                if not res["cached"]:
+                                    total_geocoded += 1
+                                writer.writerow(
+                                    {
+                                        "id": site_id,
+                                        "address": norm,
+                                        "lat": lat,
+                                        "lon": lon,
+                                        "display_name": res["display_name"],
+                                    }
+                                )
+                                rows_written += 1
+                                continue
+                            if res["cached"]:
+                                reason = "cached_failure"
+                            elif lat is None:
+                                reason = "no_result"
+                            else:
+                                reason = "coarse_skip"
                             error_rows.append(
                                 {
                                     "id": site_id,
@@ -367,89 +541,112 @@ class GeocodeWorker(QObject):
                                     "zip": zip5,
                                     "normalized_address": norm,
                                     "strategy": self.strategy.get_source_name(),
-                                    "reason": "coarse_skip",
-                                    "attempted_queries": len(strategies),
+                                    "reason": reason,
+                                    "attempted_queries": res["attempts"],
                                 }
                             )
                             total_errors += 1
-                            self.log.emit(
-                                f"State {state}: [{i}/{len(rows)}] {site_id} -> coarse match skipped (city/state only)"
-                            )
-                        else:
-                            # Success - add to output
-                            lat = got["lat"]
-                            lon = got["lon"]
-                            disp = got["display_name"]
-                            provider_name = self.strategy.get_source_name()
-                            self.cache.put(norm, lat, lon, disp, source=provider_name)
-                            total_geocoded += 1
-                            source = f"{provider_name}:{which}"
-                            out_rows.append(
-                                {
-                                    "id": site_id,
-                                    "address": norm,
-                                    "lat": lat,
-                                    "lon": lon,
-                                    "display_name": disp,
-                                }
-                            )
-                            self.log.emit(
-                                f"State {state}: [{i}/{len(rows)}] {site_id} -> {lat:.6f},{lon:.6f} ({source})"
-                            )
-                processed += 1
-                self.progress.emit(processed, grand_total)
-
-            # write outputs for this state
-            try:
-                out_dir = self.workspace / state
-                out_dir.mkdir(parents=True, exist_ok=True)
-
-                # Write successful geocodes
-                out_csv = out_dir / "geocoded.csv"
-                with out_csv.open("w", encoding="utf-8", newline="") as f:
-                    writer = csv.DictWriter(
-                        f, fieldnames=["id", "address", "lat", "lon", "display_name"]
+                    if cancelled:
+                        self._log("Cancellation requested; finishing current row and stopping…")
+                    self._log(
+                        f"State {state}: wrote {rows_written} successful geocodes to {out_csv}"
                     )
-                    writer.writeheader()
-                    writer.writerows(out_rows)
-                self.log.emit(
-                    f"State {state}: wrote {len(out_rows)} successful geocodes to {out_csv}"
-                )
 
-                # Write geocoding errors if any
-                if error_rows:
-                    error_csv = out_dir / "geocode-errors.csv"
-                    with error_csv.open("w", encoding="utf-8", newline="") as f:
-                        writer = csv.DictWriter(
-                            f,
-                            fieldnames=[
-                                "id",
-                                "address",
-                                "city",
-                                "state",
-                                "zip",
-                                "normalized_address",
-                                "strategy",
-                                "reason",
-                                "attempted_queries",
-                            ],
+                    # Write geocoding errors if any
+                    if error_rows:
+                        error_csv = out_dir / "geocode-errors.csv"
+                        with error_csv.open("w", encoding="utf-8", newline="") as f:
+                            writer = csv.DictWriter(
+                                f,
+                                fieldnames=[
+                                    "id",
+                                    "address",
+                                    "city",
+                                    "state",
+                                    "zip",
+                                    "normalized_address",
+                                    "strategy",
+                                    "reason",
+                                    "attempted_queries",
+                                ],
+                            )
+                            writer.writeheader()
+                            writer.writerows(error_rows)
+                        self._log(
+                            f"State {state}: wrote {len(error_rows)} failed geocodes to {error_csv}"
                         )
-                        writer.writeheader()
-                        writer.writerows(error_rows)
-                    self.log.emit(
-                        f"State {state}: wrote {len(error_rows)} failed geocodes to {error_csv}"
-                    )
 
-                self.state_done.emit(state, len(out_rows))
-            except Exception as e:
-                self.log.emit(f"State {state}: failed writing output files: {e}")
+                    self.state_done.emit(state, rows_written)
+                except Exception as e:
+                    self._log(f"State {state}: failed writing output files: {e}")
+
+                # If cancellation requested, stop after finishing current state write
+                if cancelled:
+                    self._log("Cancellation requested; breaking out of state loop…")
+                    break
+
+        except Exception as e:
+            self._log(f"Geocoding stopped unexpectedly: {e}")
+        finally:
+            # Release pool threads and this thread's cache connections before handing back
+            geocoder.close()
+            self.cache.close()
+            self.strategy.close()
+            if failed_states:
+                self._log(f"{failed_states} state(s) failed to geocode; see the log above.")
+            self._flush_log()
+            self._emit_progress(processed, grand_total, force=True)
+            self.finished.emit(total_lookups, total_cache_hits, total_geocoded, total_errors)
+
+
+class _ColumnsModel(QAbstractTableModel):
+    """
+    Read-only table model over a header and one value sequence per column.
 
-            # If cancellation requested, stop after finishing current state write
-            if cancelled:
-                self.log.emit("Cancellation requested; breaking out of state loop…")
-                break
+    Cells are formatted only when the view asks for them (visible rows),
+    so loading a large geocoded.csv creates no per-cell objects. None
+    values display as empty cells.
+    """
 
-        self.finished.emit(total_lookups, total_cache_hits, total_geocoded, total_errors)
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._headers: List[str] = []
+        self._columns: List[Sequence[Any]] = []
+        self._rows = 0
+
+    def set_columns(self, headers: List[str], columns: List[Sequence[Any]]) -> None:
+        # One model reset replaces the whole preview
+        self.beginResetModel()
+        self._headers = headers
+        self._columns = columns[: len(headers)]
+        self._rows = len(self._columns[0]) if self._columns else 0
+        self.endResetModel()
+
+    def text(self, row: int, col: int) -> str:
+        if col >= len(self._columns):
+            return ""
+        value = self._columns[col][row]
+        return "" if value is None else str(value)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.text(index.row(), index.column())
+
+    def headerData(
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return section + 1
 
 
 class GeocodeTab(QWidget):
@@ -496,6 +693,33 @@ class GeocodeTab(QWidget):
             lambda: self._save_email(self.email_input.text().strip())
         )
 
+        # Optional self-hosted Nominatim; its rate limit and concurrency are the user's call.
+        # The public server always runs one request at a time at ~1 req/s
+        self.server_input = QLineEdit()
+        self.server_input.setPlaceholderText(f"{PUBLIC_SEARCH_URL} (public, 1 req/s)")
+        form.addRow("Nominatim server:", self.server_input)
+        server_row = QHBoxLayout()
+        server_row.setContentsMargins(0, 0, 0, 0)
+        self.interval_input = QDoubleSpinBox()
+        self.interval_input.setRange(0.0, 10.0)
+        self.interval_input.setDecimals(2)
+        self.interval_input.setSingleStep(0.05)
+        self.interval_input.setSuffix(" s")
+        self.interval_input.setToolTip("Minimum time between requests to the self-hosted server")
+        self.workers_input = QSpinBox()
+        self.workers_input.setRange(1, MAX_WORKERS)
+        self.workers_input.setToolTip("Requests in flight at once against the self-hosted server")
+        server_row.addWidget(QLabel("Min interval:"))
+        server_row.addWidget(self.interval_input)
+        server_row.addSpacing(12)
+        server_row.addWidget(QLabel("Workers:"))
+        server_row.addWidget(self.workers_input)
+        server_row.addStretch(1)
+        form.addRow("", self._wrap(server_row))
+        self._load_server_settings()
+        self.server_input.textChanged.connect(self._on_server_changed)
+        self._on_server_changed(self.server_input.text())
+
         layout.addLayout(form)
 
         actions_row = QHBoxLayout()
@@ -627,10 +851,11 @@ class GeocodeTab(QWidget):
         right_box = QVBoxLayout()
         right_label = QLabel("geocoded.csv preview")
         right_label.setStyleSheet("font-weight: 600;")
-        self.table = QTableWidget()
+        # Model/view: cells are served from column lists, no per-cell item objects
+        self.table = QTableView()
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.table.setColumnCount(0)
-        self.table.setRowCount(0)
+        self._table_model = _ColumnsModel(self.table)
+        self.table.setModel(self._table_model)
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self._show_table_context_menu)
         right_box.addWidget(right_label)
@@ -713,9 +938,8 @@ class GeocodeTab(QWidget):
         # Determine states ready to geocode (have addresses.csv)
         states: List[str] = []
         try:
-            for p in sorted(self.workspace.iterdir()):
-                if p.is_dir() and (p / "addresses.csv").exists():
-                    states.append(p.name)
+            dirs = subdir_names(self.workspace)
+            states = [name for name in dirs if (self.workspace / name / "addresses.csv").exists()]
         except Exception:
             pass
         if not states:
@@ -738,7 +962,20 @@ class GeocodeTab(QWidget):
         # Logger will be set up by the worker thread
         from app.geocoding import NominatimStrategy
 
-        strategy = NominatimStrategy(email=email)
+        self._save_server_settings()
+        server = self.server_input.text().strip()
+        max_workers: Optional[int] = None
+        if server:
+            strategy = NominatimStrategy(
+                email=email, base_url=server, min_interval=self.interval_input.value()
+            )
+            max_workers = self.workers_input.value()
+            self.log_append(
+                f"Using Nominatim at {server}: {max_workers} worker(s), "
+                f"{self.interval_input.value():.2f}s between requests."
+            )
+        else:
+            strategy = NominatimStrategy(email=email)
 
         # Disable actions during run
         if hasattr(self, "geocode_btn"):
@@ -755,7 +992,7 @@ class GeocodeTab(QWidget):
             self.progress.setValue(0)
         # Start worker thread
         self.worker_thread = QThread(self)
-        self.worker = GeocodeWorker(self.workspace, states, strategy)
+        self.worker = GeocodeWorker(self.workspace, states, strategy, max_workers=max_workers)
         self.worker.moveToThread(self.worker_thread)
         self.worker_thread.started.connect(self.worker.run)
         # Connect signals
@@ -870,16 +1107,16 @@ class GeocodeTab(QWidget):
             return
         try:
             states = []
-            for p in sorted(self.workspace.iterdir()):
-                if p.is_dir():
-                    # Include states that are ready to geocode (addresses.csv)
-                    # as well as those already geocoded (geocoded.csv)
-                    has_addresses = (p / "addresses.csv").exists()
-                    has_geocoded = (p / "geocoded.csv").exists()
-                    if has_addresses or has_geocoded:
-                        states.append(p.name)
-            for st in states:
-                self.state_list.addItem(st)
+            dirs = subdir_names(self.workspace)
+            for name in dirs:
+                p = self.workspace / name
+                # Include states that are ready to geocode (addresses.csv)
+                # as well as those already geocoded (geocoded.csv)
+                has_addresses = (p / "addresses.csv").exists()
+                has_geocoded = (p / "geocoded.csv").exists()
+                if has_addresses or has_geocoded:
+                    states.append(name)
+            self.state_list.addItems(states)
         except Exception:
             self.log_append("Failed to refresh state list")
         # Update single-state geocode button enabled state
@@ -911,10 +1148,7 @@ class GeocodeTab(QWidget):
             return
         # Load CSV and populate table
         try:
-            import pandas as pd  # type: ignore
-
-            df = pd.read_csv(csv_path)
-            self.populate_table_from_dataframe(df)
+            self._populate_table_from_arrow(csv_path)
         except Exception:
             try:
                 import csv
@@ -925,33 +1159,38 @@ class GeocodeTab(QWidget):
                 if not rows:
                     self.clear_table()
                     return
-                headers = rows[0]
-                data_rows = rows[1:]
-                self.table.setColumnCount(len(headers))
-                self.table.setHorizontalHeaderLabels(headers)
-                self.table.setRowCount(len(data_rows))
-                for r, row_vals in enumerate(data_rows):
-                    for c, val in enumerate(row_vals):
-                        self.table.setItem(r, c, QTableWidgetItem(str(val)))
-                self._apply_table_column_sizing(headers)
+                # Transpose to columns; short rows get empty cells
+                columns = list(itertools.zip_longest(*rows[1:], fillvalue=""))
+                self._fill_table(rows[0], columns)
             except Exception:
                 self.clear_table()
 
     def populate_table_from_dataframe(self, df) -> None:  # type: ignore[no-untyped-def]
-        headers = list(df.columns)
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels([str(h) for h in headers])
-        self.table.setRowCount(len(df))
-        for r, (_, row) in enumerate(df.iterrows()):
-            for c, h in enumerate(headers):
-                self.table.setItem(r, c, QTableWidgetItem(str(row[h])))
-        self._apply_table_column_sizing([str(h) for h in headers])
+        # Columns are handed to the model as-is; no per-row Series (iterrows)
+        self._fill_table(
+            [str(h) for h in df.columns], [df.iloc[:, c].to_numpy() for c in range(df.shape[1])]
+        )
+
+    def _populate_table_from_arrow(self, csv_path: Path) -> None:
+        # pyarrow parses in C on several threads and hands back columns directly;
+        # pandas is the fallback when it is not installed
+        try:
+            import pyarrow.csv as pacsv  # type: ignore
+        except ImportError:
+            import pandas as pd  # type: ignore
+
+            self.populate_table_from_dataframe(pd.read_csv(csv_path))
+            return
+        table = pacsv.read_csv(csv_path, read_options=pacsv.ReadOptions(use_threads=True))
+        self._fill_table(table.column_names, [col.to_pylist() for col in table.columns])
+
+    def _fill_table(self, headers: List[str], columns: List[Sequence[Any]]) -> None:
+        self._table_model.set_columns(headers, columns)
+        self._apply_table_column_sizing(headers)
 
     def clear_table(self) -> None:
         if hasattr(self, "table"):
-            self.table.clear()
-            self.table.setColumnCount(0)
-            self.table.setRowCount(0)
+            self._table_model.set_columns([], [])
 
     def _on_refresh_view(self) -> None:
         self.refresh_state_list()
@@ -969,13 +1208,7 @@ class GeocodeTab(QWidget):
             if not addr_csv.exists():
                 self.state_count.setText("0 sites")
                 return
-            count = 0
-            with addr_csv.open("r", encoding="utf-8", newline="") as f:
-                reader = csv.reader(f)
-                # skip header
-                next(reader, None)
-                for _ in reader:
-                    count += 1
+            count = _count_if_changed(_count_rows, addr_csv)
             self.state_count.setText(f"{count} site" + ("s" if count != 1 else ""))
         except Exception:
             self.state_count.setText("0 sites")
@@ -986,23 +1219,9 @@ class GeocodeTab(QWidget):
                 self.geocode_status.setText("0 of 0 geocoded")
                 return
             addr_csv = self.workspace / state_code / "addresses.csv"
-            total = 0
-            if addr_csv.exists():
-                with addr_csv.open("r", encoding="utf-8", newline="") as f:
-                    reader = csv.reader(f)
-                    next(reader, None)
-                    for _ in reader:
-                        total += 1
-            done = 0
+            total = _count_if_changed(_count_rows, addr_csv) if addr_csv.exists() else 0
             geo_csv = self.workspace / state_code / "geocoded.csv"
-            if geo_csv.exists():
-                with geo_csv.open("r", encoding="utf-8", newline="") as f:
-                    reader = csv.DictReader(f)
-                    for r in reader:
-                        lat = str(r.get("lat", "")).strip()
-                        lon = str(r.get("lon", "")).strip()
-                        if lat and lon:
-                            done += 1
+            done = _count_if_changed(_count_geocoded, geo_csv) if geo_csv.exists() else 0
             self.geocode_status.setText(f"{done} of {total} geocoded")
         except Exception:
             self.geocode_status.setText("0 of 0 geocoded")
@@ -1065,27 +1284,53 @@ class GeocodeTab(QWidget):
     # ---------------------
     def _load_email(self) -> None:
         saved = self.settings.value("geocodeEmail", "", type=str) or ""
+        # Last persisted value; focus changes and reruns skip the settings write
+        self._saved_email = saved
         if saved:
             self.email_input.setText(saved)
 
     def _save_email(self, email: str) -> None:
-        if email and "@" in email:
+        if email and "@" in email and email != self._saved_email:
+            self._saved_email = email
             self.settings.setValue("geocodeEmail", email)
             try:
                 self.settings.sync()
             except Exception:
                 pass
 
+    def _load_server_settings(self) -> None:
+        self.server_input.setText(self.settings.value("geocodeServer", "", type=str) or "")
+        self.interval_input.setValue(
+            self.settings.value("geocodeMinInterval", DEFAULT_MIN_INTERVAL, type=float)
+        )
+        self.workers_input.setValue(self.settings.value("geocodeMaxWorkers", 1, type=int))
+        self._saved_server = self._server_settings()
+
+    def _server_settings(self) -> Tuple[str, float, int]:
+        return (
+            self.server_input.text().strip(),
+            self.interval_input.value(),
+            self.workers_input.value(),
+        )
+
+    def _save_server_settings(self) -> None:
+        current = self._server_settings()
+        if current == self._saved_server:
+            return
+        self._saved_server = current
+        server, interval, workers = current
+        self.settings.setValue("geocodeServer", server)
+        self.settings.setValue("geocodeMinInterval", interval)
+        self.settings.setValue("geocodeMaxWorkers", workers)
+
+    def _on_server_changed(self, text: str) -> None:
+        # Rate settings only apply to a self-hosted server
+        custom = bool(text.strip())
+        self.interval_input.setEnabled(custom)
+        self.workers_input.setEnabled(custom)
+
     def _territory_full_name(self, code: str) -> Optional[str]:
-        mapping = {
-            "PR": "Puerto Rico",
-            "GU": "Guam",
-            "VI": "U.S. Virgin Islands",
-            "MP": "Northern Mariana Islands",
-            "AS": "American Samoa",
-            "DC": "District of Columbia",
-        }
-        return mapping.get(code.upper())
+        return _TERRITORY_NAMES.get(code.upper())
 
     def on_clear_cache(self) -> None:
         # Clear the shared SQLite cache and refresh UI. Do not reference geocoding counters here.
@@ -1162,15 +1407,12 @@ class GeocodeTab(QWidget):
             return
 
         # Get the address from the table (column 1 is "address")
-        address_item = self.table.item(row, 1)
-        if not address_item:
+        normalized_address = self._table_model.text(row, 1)
+        if not normalized_address:
             return
 
-        normalized_address = address_item.text()
-
         # Get site ID for display (column 0)
-        id_item = self.table.item(row, 0)
-        site_id = id_item.text() if id_item else "Unknown"
+        site_id = self._table_model.text(row, 0) or "Unknown"
 
         menu = QMenu(self)
 
@@ -23,6 +23,8 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from app.tabs.workspace_tab import subdir_names
+
 
 class ParseTab(QWidget):
     def __init__(self, parent: Optional[QWidget] = None) -> None:
@@ -455,14 +457,9 @@ class ParseTab(QWidget):
         if not self.workspace:
             return
         try:
-            states = []
-            for p in sorted(self.workspace.iterdir()):
-                if p.is_dir():
-                    csv_path = p / "addresses.csv"
-                    if csv_path.exists():
-                        states.append(p.name)
-            for st in states:
-                self.state_list.addItem(st)
+            dirs = subdir_names(self.workspace)
+            states = [name for name in dirs if (self.workspace / name / "addresses.csv").exists()]
+            self.state_list.addItems(states)
         except Exception:
             # ignore filesystem errors for now
             pass
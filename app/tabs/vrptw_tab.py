@@ -24,6 +24,8 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from app.tabs.workspace_tab import subdir_names
+
 
 class VRPTWTab(QWidget):
     """
@@ -484,14 +486,7 @@ class VRPTWTab(QWidget):
         self.results.setColumnCount(len(headers))
         self.results.setHorizontalHeaderLabels(headers)
         if all_rows:
-            self.results.setRowCount(len(all_rows))
-            for r, (st, cid_label, v, seq_ids) in enumerate(all_rows):
-                self.results.setItem(r, 0, QTableWidgetItem(str(st)))
-                self.results.setItem(r, 1, QTableWidgetItem(str(cid_label)))
-                self.results.setItem(r, 2, QTableWidgetItem(str(v)))
-                self.results.setItem(r, 3, QTableWidgetItem(str(len(seq_ids))))
-                self.results.setItem(r, 4, QTableWidgetItem(", ".join(seq_ids)))
-            self.results.resizeColumnsToContents()
+            self._fill_results(all_rows)
             # Metrics
             vehicle_days = len(all_rows)
             total_stops = sum(len(seq_ids) for (_, _, _, seq_ids) in all_rows)
@@ -544,13 +539,27 @@ class VRPTWTab(QWidget):
         if not self.workspace or not self.workspace.exists():
             return
         try:
-            for p in sorted([d for d in self.workspace.iterdir() if d.is_dir()]):
-                if p.name.startswith("."):
-                    continue
-                self.state_list.addItem(p.name)
+            self.state_list.addItems(subdir_names(self.workspace, skip_hidden=True))
         except Exception as e:
             self.log_append(f"Failed listing states: {e}")
 
+    def _fill_results(self, all_rows: list[tuple[str, str, int, list[str]]]) -> None:
+        # Insert every row with repaints and item signals suspended, then lay out once
+        self.results.setUpdatesEnabled(False)
+        self.results.blockSignals(True)
+        try:
+            self.results.setRowCount(len(all_rows))
+            for r, (st, cid_label, v, seq_ids) in enumerate(all_rows):
+                self.results.setItem(r, 0, QTableWidgetItem(str(st)))
+                self.results.setItem(r, 1, QTableWidgetItem(str(cid_label)))
+                self.results.setItem(r, 2, QTableWidgetItem(str(v)))
+                self.results.setItem(r, 3, QTableWidgetItem(str(len(seq_ids))))
+                self.results.setItem(r, 4, QTableWidgetItem(", ".join(seq_ids)))
+        finally:
+            self.results.blockSignals(False)
+            self.results.setUpdatesEnabled(True)
+        self.results.resizeColumnsToContents()
+
     def _clear_results(self) -> None:
         self.results.clear()
         self.results.setColumnCount(0)
@@ -1013,14 +1022,7 @@ class VRPTWTab(QWidget):
         self.results.setHorizontalHeaderLabels(headers)
 
         if all_rows:
-            self.results.setRowCount(len(all_rows))
-            for r, (st, cid_label, v, seq_ids) in enumerate(all_rows):
-                self.results.setItem(r, 0, QTableWidgetItem(str(st)))
-                self.results.setItem(r, 1, QTableWidgetItem(str(cid_label)))
-                self.results.setItem(r, 2, QTableWidgetItem(str(v)))
-                self.results.setItem(r, 3, QTableWidgetItem(str(len(seq_ids))))
-                self.results.setItem(r, 4, QTableWidgetItem(", ".join(seq_ids)))
-            self.results.resizeColumnsToContents()
+            self._fill_results(all_rows)
 
             # Update last_solution for map functionality
             self.last_solution = {
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -19,6 +20,18 @@ from PyQt6.QtWidgets import (
 DEFAULT_BASE = Path.home() / "Documents" / "VRPTW"
 
 
+def subdir_names(path: Path, skip_hidden: bool = False) -> list[str]:
+    """Sorted names of the folders directly under ``path``.
+
+    Shared by the tabs that list clients, workspaces and state folders.
+    """
+    # scandir reuses the d_type from readdir, so no extra stat per entry
+    with os.scandir(path) as it:
+        return sorted(
+            e.name for e in it if e.is_dir() and not (skip_hidden and e.name.startswith("."))
+        )
+
+
 class WorkspaceTab(QWidget):
     # Emits the full workspace path as a string when selection changes, or empty string if none
     workspaceChanged = pyqtSignal(str)
@@ -97,13 +110,13 @@ class WorkspaceTab(QWidget):
     def list_clients(self) -> list[str]:
         if not self.base_path.exists():
             return []
-        return sorted([p.name for p in self.base_path.iterdir() if p.is_dir()])
+        return subdir_names(self.base_path)
 
     def list_workspaces(self, client: str) -> list[str]:
         client_dir = self.base_path / client
         if not client_dir.exists():
             return []
-        return sorted([p.name for p in client_dir.iterdir() if p.is_dir()])
+        return subdir_names(client_dir)
 
     def refresh_clients(self) -> None:
         current = self.client_combo.currentText() if hasattr(self, "client_combo") else ""
@@ -0,0 +1,101 @@
+"""Tests for per-state clustering used by the Cluster tab."""
+
+import csv
+import os
+import random
+import tempfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6")
+pytest.importorskip("sklearn")
+
+from app.tabs import cluster_tab
+from app.tabs.cluster_tab import cluster_state_file
+
+
+def write_geocoded(path: Path, n: int = 60, seed: int = 1) -> None:
+    """Write a geocoded.csv with a text ZIP column and random coordinates."""
+    rng = random.Random(seed)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "zip", "lat", "lon"])
+        for i in range(n):
+            writer.writerow([i, "01234", 40 + rng.random(), -88 + rng.random()])
+
+
+def run(geo_csv: Path, k: int = 3):
+    lines = []
+    ok = cluster_state_file("IL", geo_csv, k, lines.append)
+    return ok, lines
+
+
+def test_cluster_state_file_writes_cluster_ids():
+    """Test that every row gets a cluster id and other columns are copied as text."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        geo_csv = Path(tmpdir) / "geocoded.csv"
+        write_geocoded(geo_csv)
+        ok, _ = run(geo_csv)
+        assert ok
+        with geo_csv.with_name("clustered.csv").open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 60
+        assert {r["cluster_id"] for r in rows} == {"0", "1", "2"}
+        assert all(r["zip"] == "01234" for r in rows)
+
+
+def test_cluster_state_file_reuses_unchanged_result(monkeypatch):
+    """Test that unchanged inputs skip the fit, even if the file was only touched."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        geo_csv = Path(tmpdir) / "geocoded.csv"
+        write_geocoded(geo_csv)
+        assert run(geo_csv)[0]
+
+        # Untouched file: the size/mtime check suffices, nothing is hashed
+        hashed = []
+        real_sha = cluster_tab._file_sha256
+        monkeypatch.setattr(cluster_tab, "_file_sha256", lambda p: hashed.append(p) or real_sha(p))
+        ok, lines = run(geo_csv)
+        assert ok and any("cached" in line for line in lines)
+        assert hashed == []
+
+        # Same contents, newer mtime: detected through the content hash
+        st = geo_csv.stat()
+        os.utime(geo_csv, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        ok, lines = run(geo_csv)
+        assert ok and any("cached" in line for line in lines)
+
+        # A different k is a different result
+        ok, lines = run(geo_csv, k=4)
+        assert ok and not any("cached" in line for line in lines)
+
+
+def test_cluster_state_file_refits_changed_input():
+    """Test that rewritten coordinates trigger a new fit."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        geo_csv = Path(tmpdir) / "geocoded.csv"
+        write_geocoded(geo_csv)
+        assert run(geo_csv)[0]
+        write_geocoded(geo_csv, seed=2)
+        ok, lines = run(geo_csv)
+        assert ok and not any("cached" in line for line in lines)
+
+
+@pytest.mark.parametrize("k, expected", [(1, {"0"}), (10, {"0", "1", "2"})])
+def test_cluster_state_file_trivial_k_skips_fit(k, expected):
+    """Test that k=1 or k >= unique points labels rows without fitting."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        geo_csv = Path(tmpdir) / "geocoded.csv"
+        with geo_csv.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "lat", "lon"])
+            for i, (lat, lon) in enumerate([(40, -88), (41, -88), (40, -87), (40, -88)]):
+                writer.writerow([i, lat, lon])
+        ok, lines = run(geo_csv, k=k)
+        assert ok and any("needs no fit" in line for line in lines)
+        with geo_csv.with_name("clustered.csv").open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert {r["cluster_id"] for r in rows} == expected
+        # Duplicate coordinates share a cluster
+        assert rows[0]["cluster_id"] == rows[3]["cluster_id"]
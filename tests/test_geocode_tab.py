@@ -0,0 +1,231 @@
+"""Tests for the background worker used by the Geocode tab."""
+
+import csv
+import tempfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from app.geocoding import GeocodingCache, GeocodingStrategy
+from app.tabs import geocode_tab
+
+
+class FakeStrategy(GeocodingStrategy):
+    """Strategy that resolves every query except those naming Nowhere."""
+
+    def geocode(self, query):
+        if "Nowhere" in query:
+            return None
+        return {"lat": 1.0, "lon": 2.0, "display_name": query}
+
+    def get_source_name(self):
+        return "fake"
+
+    def get_rate_limit_delay(self):
+        return 0.001
+
+
+def run_worker(monkeypatch, workspace: Path, states):
+    """Run a GeocodeWorker synchronously against a throwaway cache."""
+
+    class TmpCache(GeocodingCache):
+        def __init__(self):
+            super().__init__(cache_dir=workspace / ".cache")
+
+    monkeypatch.setattr(geocode_tab, "GeocodingCache", TmpCache)
+    worker = geocode_tab.GeocodeWorker(workspace, states, FakeStrategy())
+    progress, done, finished, logs = [], [], [], []
+    worker.progress.connect(lambda n, total: progress.append((n, total)))
+    worker.state_done.connect(lambda state, n: done.append((state, n)))
+    worker.finished.connect(lambda *totals: finished.append(totals))
+    worker.log.connect(logs.append)
+    worker.run()
+    return progress, done, finished, logs
+
+
+def test_worker_geocodes_state_and_writes_outputs(monkeypatch):
+    """Test that rows are streamed, counted up front and split into outputs."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workspace = Path(tmpdir)
+        (workspace / "IL").mkdir()
+        with (workspace / "IL" / "addresses.csv").open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "address", "city", "state", "zip"])
+            for i in range(20):
+                writer.writerow([i, f"{i} Main St", "Springfield", "IL", "62701"])
+            writer.writerow([98, "", "Springfield", "IL", "62701"])
+            # Short row: the missing zip reads as empty
+            writer.writerow([97, "5 Oak St", "Springfield", "IL"])
+            writer.writerow([99, "1 Elm St", "Nowhere", "IL", "62701"])
+
+        # WI has no addresses.csv and is skipped
+        progress, done, finished, logs = run_worker(monkeypatch, workspace, ["IL", "WI"])
+
+        assert progress[0] == (0, 23)
+        assert progress[-1] == (23, 23)
+        assert done == [("IL", 20)]
+        assert finished == [(21, 0, 20, 3)]
+        with (workspace / "IL" / "geocoded.csv").open(newline="", encoding="utf-8") as f:
+            assert [r["id"] for r in csv.DictReader(f)] == [str(i) for i in range(20)]
+        with (workspace / "IL" / "geocode-errors.csv").open(newline="", encoding="utf-8") as f:
+            reasons = {r["id"]: r["reason"] for r in csv.DictReader(f)}
+        assert reasons == {"97": "missing_fields", "98": "missing_fields", "99": "no_result"}
+
+        # Per-row log lines reach the UI in batches, not one signal per row
+        lines = "\n".join(logs).splitlines()
+        assert sum("[" in line and "/23]" in line for line in lines) == 21
+        assert len(logs) < 21
+
+
+def test_worker_summarizes_cache_hits(monkeypatch):
+    """Test that a re-run is answered from the cache with one summary line."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workspace = Path(tmpdir)
+        (workspace / "IL").mkdir()
+        with (workspace / "IL" / "addresses.csv").open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "address", "city", "state", "zip"])
+            for i in range(5):
+                writer.writerow([i, f"{i} Main St", "Springfield", "IL", "62701"])
+
+        run_worker(monkeypatch, workspace, ["IL"])
+        _, done, finished, logs = run_worker(monkeypatch, workspace, ["IL"])
+
+        assert done == [("IL", 5)]
+        assert finished == [(5, 5, 0, 0)]
+        lines = "\n".join(logs).splitlines()
+        assert "State IL: 5 row(s) answered from cache" in lines
+        assert not any("(cache)" in line for line in lines)
+
+
+def test_row_counters():
+    """Test newline-based row counts and the lat/lon-based geocoded count."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        addresses = tmp_path / "addresses.csv"
+        addresses.write_bytes(b"id,address\n1,a\n2,b\n3,c")
+        assert geocode_tab._count_rows(addresses) == 3
+        addresses.write_bytes(b"id,address\n1,a\n")
+        assert geocode_tab._count_rows(addresses) == 1
+        addresses.write_bytes(b"")
+        assert geocode_tab._count_rows(addresses) == 0
+
+        geocoded = tmp_path / "geocoded.csv"
+        with geocoded.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "address", "lat", "lon", "display_name"])
+            writer.writerow([1, "1 Main St, Springfield, IL 62701, USA", 40.1, -88.2, "A, B"])
+            writer.writerow([2, "2 Main St, Springfield, IL 62701, USA", "", "", ""])
+            writer.writerow([3, "3 Main St, Springfield, IL 62701, USA", 40.3, -88.3, "C"])
+        assert geocode_tab._count_geocoded(geocoded) == 2
+        # csv module fallback used without pyarrow
+        assert geocode_tab._count_geocoded_csv(geocoded) == 2
+
+        # A ragged row makes pyarrow reject the file; the csv module still counts it
+        with geocoded.open("a", newline="", encoding="utf-8") as f:
+            f.write("4,4 Main St,40.4,-88.4,D,extra\n")
+        assert geocode_tab._count_geocoded(geocoded) == 3
+
+
+def test_row_counts_are_reused_until_the_file_changes():
+    """Test that an unchanged file is not recounted and a rewritten one is."""
+    calls = []
+
+    def counter(path):
+        calls.append(path)
+        return geocode_tab._count_rows(path)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "addresses.csv"
+        path.write_bytes(b"id\n1\n2\n")
+        assert geocode_tab._count_if_changed(counter, path) == 2
+        assert geocode_tab._count_if_changed(counter, path) == 2
+        assert len(calls) == 1
+
+        path.write_bytes(b"id\n1\n2\n3\n")
+        assert geocode_tab._count_if_changed(counter, path) == 3
+        assert len(calls) == 2
+
+
+def test_worker_failed_state_keeps_outputs_and_continues(monkeypatch):
+    """Test that a geocoding error leaves the state's files alone and later states still run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workspace = Path(tmpdir)
+        for state, zip5 in (("IL", "62701"), ("WI", "53703")):
+            (workspace / state).mkdir()
+            with (workspace / state / "addresses.csv").open("w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["id", "address", "city", "state", "zip"])
+                writer.writerow([1, "1 Main St", "Town", state, zip5])
+        previous = "id,address,lat,lon,display_name\n1,old,1.0,2.0,old\n"
+        (workspace / "IL" / "geocoded.csv").write_text(previous, encoding="utf-8")
+
+        real = geocode_tab.Geocoder.geocode_many
+
+        def geocode_many(self, addresses, **kwargs):
+            addresses = list(addresses)
+            if any(", IL " in a for a in addresses):
+                raise RuntimeError("boom")
+            return real(self, addresses, **kwargs)
+
+        monkeypatch.setattr(geocode_tab.Geocoder, "geocode_many", geocode_many)
+        _, done, _, logs = run_worker(monkeypatch, workspace, ["IL", "WI"])
+
+        assert done == [("WI", 1)]
+        assert (workspace / "IL" / "geocoded.csv").read_text(encoding="utf-8") == previous
+        text = "\n".join(logs)
+        assert "State IL: geocoding failed" in text
+        assert "Cancellation requested" not in text
+
+
+def test_worker_cleans_up_and_finishes_after_unexpected_error(monkeypatch):
+    """Test that an error outside the per-state handlers still closes resources and finishes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workspace = Path(tmpdir)
+        (workspace / "IL").mkdir()
+        (workspace / "IL" / "addresses.csv").write_text(
+            "id,address,city,state,zip\n1,1 Main St,Town,IL,62701\n", encoding="utf-8"
+        )
+
+        def count_rows(path):
+            raise RuntimeError("boom")
+
+        closed = []
+        real_close = geocode_tab.Geocoder.close
+        monkeypatch.setattr(geocode_tab, "_count_rows", count_rows)
+        monkeypatch.setattr(
+            geocode_tab.Geocoder, "close", lambda self: closed.append(1) or real_close(self)
+        )
+        progress, done, finished, logs = run_worker(monkeypatch, workspace, ["IL"])
+
+        assert closed == [1]
+        assert done == []
+        assert finished == [(0, 0, 0, 0)]
+        assert progress[-1] == (0, 0)
+        assert "Geocoding stopped unexpectedly: boom" in "\n".join(logs)
+
+
+def test_worker_counts_parsed_rows_not_lines(monkeypatch):
+    """Test that quoted newlines and blank lines do not inflate the row totals."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workspace = Path(tmpdir)
+        (workspace / "IL").mkdir()
+        (workspace / "IL" / "addresses.csv").write_text(
+            "id,address,city,state,zip\n"
+            '1,"1 Main St\nSuite 2",Springfield,IL,62701\n'
+            "\n"
+            "2,2 Main St,Springfield,IL,62701\n"
+            "\n",
+            encoding="utf-8",
+        )
+
+        progress, done, finished, logs = run_worker(monkeypatch, workspace, ["IL"])
+
+        assert done == [("IL", 2)]
+        assert finished == [(2, 0, 2, 0)]
+        assert progress[-1] == (2, 2)
+        lines = "\n".join(logs).splitlines()
+        assert sum("/2]" in line for line in lines) == 2
+        assert not any("/5]" in line for line in lines)
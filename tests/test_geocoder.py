@@ -0,0 +1,149 @@
+"""Tests for cache-first batch geocoding."""
+
+import tempfile
+import time
+from pathlib import Path
+
+from app.geocoding import Geocoder, GeocodingCache, GeocodingStrategy
+
+
+class FakeStrategy(GeocodingStrategy):
+    """Strategy answering from a fixed table and recording every query."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+
+    def geocode(self, query):
+        self.queries.append(query)
+        return self.answers.get(query)
+
+    def get_source_name(self):
+        return "fake"
+
+    def get_rate_limit_delay(self):
+        return 0.001
+
+
+def test_geocode_many_uses_cache_then_fetches_misses():
+    """Test that only cache misses reach the strategy and results are written back."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = GeocodingCache(cache_dir=Path(tmpdir))
+        cache.put("Cached", 1.0, 1.0, "Cached Display", source="nominatim")
+        strategy = FakeStrategy({"Fresh": {"lat": 2.0, "lon": 2.0, "display_name": "Fresh"}})
+
+        with Geocoder(strategy, cache) as geocoder:
+            results = geocoder.geocode_many(["Cached", "Fresh", "Fresh", "Unknown"])
+
+        assert results["Cached"]["cached"] is True
+        assert results["Fresh"]["cached"] is False
+        assert results["Fresh"]["label"] == "full"
+        assert results["Unknown"]["lat"] is None
+        assert sorted(strategy.queries) == ["Fresh", "Unknown"]
+
+        # Successes and failures are both cached
+        assert cache.get("Fresh")["source"] == "fake"
+        assert cache.get("Unknown")["source"] == "none"
+
+
+def test_geocode_many_fallbacks_and_uncacheable_labels():
+    """Test fallback order, attempt counts and that coarse matches are not cached."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = GeocodingCache(cache_dir=Path(tmpdir))
+        strategy = FakeStrategy({"Springfield, IL": {"lat": 3.0, "lon": 3.0, "display_name": "SP"}})
+        fallbacks = {"Addr": [("Addr", "full"), ("Springfield, IL", "city-state")]}
+
+        with Geocoder(strategy, cache) as geocoder:
+            results = geocoder.geocode_many(
+                ["Addr"], fallbacks=fallbacks, uncacheable_labels=("city-state",)
+            )
+
+        assert results["Addr"]["label"] == "city-state"
+        assert results["Addr"]["attempts"] == 2
+        assert cache.get("Addr") is None
+
+
+def test_geocode_many_cancelled_leaves_misses_unresolved():
+    """Test that cancellation skips provider requests and caches nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = GeocodingCache(cache_dir=Path(tmpdir))
+        strategy = FakeStrategy({})
+
+        with Geocoder(strategy, cache) as geocoder:
+            results = geocoder.geocode_many(["A", "B"], should_cancel=lambda: True)
+
+        assert results == {"A": None, "B": None}
+        assert strategy.queries == []
+        assert cache.get_cache_stats()["total"] == 0
+
+
+def test_geocode_many_sends_shared_fallback_queries_once():
+    """Test that a fallback query shared by several addresses reaches the provider once."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = GeocodingCache(cache_dir=Path(tmpdir))
+        strategy = FakeStrategy({"Springfield, IL": {"lat": 3.0, "lon": 3.0, "display_name": "SP"}})
+        fallbacks = {
+            addr: [(addr, "full"), ("Springfield, IL", "city-state")] for addr in ("A", "B", "C")
+        }
+
+        with Geocoder(strategy, cache, max_workers=1) as geocoder:
+            results = geocoder.geocode_many(
+                ["A", "B", "C"], fallbacks=fallbacks, uncacheable_labels=("city-state",)
+            )
+            # Later batches on the same geocoder reuse the answer too
+            again = geocoder.geocode_many(["D"], fallbacks={"D": fallbacks["A"][1:]})
+
+        assert all(results[a]["label"] == "city-state" for a in "ABC")
+        assert all(results[a]["attempts"] == 2 for a in "ABC")
+        assert again["D"]["lat"] == 3.0
+        assert sorted(strategy.queries) == ["A", "B", "C", "Springfield, IL"]
+
+
+def test_geocode_many_retries_shared_queries_that_failed():
+    """Test that an empty answer is not remembered, so a later address asks again."""
+
+    class FlakyStrategy(FakeStrategy):
+        def geocode(self, query):
+            self.queries.append(query)
+            # The shared fallback fails once (e.g. a timeout), then answers
+            if query == "Springfield, IL" and self.queries.count(query) == 1:
+                return None
+            return self.answers.get(query)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = GeocodingCache(cache_dir=Path(tmpdir))
+        strategy = FlakyStrategy(
+            {"Springfield, IL": {"lat": 3.0, "lon": 3.0, "display_name": "SP"}}
+        )
+        fallbacks = {addr: [(addr, "full"), ("Springfield, IL", "city-state")] for addr in "ABC"}
+
+        with Geocoder(strategy, cache, max_workers=1) as geocoder:
+            results = geocoder.geocode_many(
+                ["A", "B", "C"], fallbacks=fallbacks, uncacheable_labels=("city-state",)
+            )
+
+        assert results["A"]["lat"] is None
+        assert results["B"]["lat"] == 3.0 and results["C"]["lat"] == 3.0
+        assert strategy.queries.count("Springfield, IL") == 2
+
+
+def test_geocode_many_shares_in_flight_queries():
+    """Test that concurrent addresses needing the same query wait for one request."""
+
+    class SlowStrategy(FakeStrategy):
+        def geocode(self, query):
+            time.sleep(0.02)
+            return super().geocode(query)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = GeocodingCache(cache_dir=Path(tmpdir))
+        strategy = SlowStrategy({"Springfield, IL": {"lat": 3.0, "lon": 3.0, "display_name": "SP"}})
+        addresses = [f"Addr{i}" for i in range(8)]
+        # Every address goes straight to the shared query
+        fallbacks = {addr: [("Springfield, IL", "city-state")] for addr in addresses}
+
+        with Geocoder(strategy, cache, max_workers=8) as geocoder:
+            results = geocoder.geocode_many(addresses, fallbacks=fallbacks)
+
+        assert all(results[a]["lat"] == 3.0 for a in addresses)
+        assert strategy.queries == ["Springfield, IL"]
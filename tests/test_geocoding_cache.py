@@ -2,7 +2,9 @@
 Unit tests for the GeocodingCache class.
 """
 
+import contextlib
 import tempfile
+import time
 from pathlib import Path
 
 import pytest
@@ -46,14 +48,30 @@ class TestGeocodingCache:
             cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='addresses'")
             assert cur.fetchone() is not None
 
-            # Verify index exists
+            # Verify the table is keyed by the address itself, with the state index
+            cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='addresses'")
+            assert "WITHOUT ROWID" in cur.fetchone()[0]
+            pk = [row[1] for row in cur.execute("PRAGMA table_info(addresses)") if row[5]]
+            assert pk == ["normalized_address"]
             cur.execute(
-                "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_addresses_norm'"
+                "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_addresses_state'"
             )
             assert cur.fetchone() is not None
 
             conn.close()
 
+    def test_connect_enables_wal(self):
+        """Test that connect() switches the database to WAL journaling."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            conn = cache.connect()
+            try:
+                mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                assert mode.lower() == "wal"
+                assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+            finally:
+                conn.close()
+
     def test_put_and_get_success(self):
         """Test storing and retrieving a successful geocoding result."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -71,6 +89,7 @@ class TestGeocodingCache:
             assert result["display_name"] == "Springfield, IL"
             assert result["source"] == "nominatim"
             assert "updated_at" in result
+            assert isinstance(result["updated_at"], int)
 
     def test_put_and_get_failure(self):
         """Test storing and retrieving a failed geocoding attempt."""
@@ -115,6 +134,82 @@ class TestGeocodingCache:
             assert result["lon"] == -89.6501
             assert result["display_name"] == "New Display"
 
+    def test_put_many(self):
+        """Test storing several results in one batch, including updates."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            cache.put("Addr1", 0.0, 0.0, "Old", source="nominatim")
+
+            cache.put_many(
+                [
+                    ("Addr1", 1.0, 1.0, "Display1", "nominatim"),
+                    ("Addr2", None, None, "", "none"),
+                ]
+            )
+
+            assert cache.get("Addr1")["display_name"] == "Display1"
+            assert cache.get("Addr2")["source"] == "none"
+
+            # Empty batches are a no-op
+            cache.put_many([])
+            assert cache.get_cache_stats()["total"] == 2
+
+    def test_get_many(self):
+        """Test batched lookups return only cached addresses, across chunks."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            cache.put_many(
+                [(f"Addr{i}", float(i), float(i), f"Display{i}", "nominatim") for i in range(1000)]
+            )
+
+            wanted = [f"Addr{i}" for i in range(0, 1000, 3)] + ["Missing"]
+            results = cache.get_many(wanted)
+
+            assert len(results) == len(wanted) - 1
+            assert "Missing" not in results
+            assert results["Addr999"]["lat"] == 999.0
+            assert results["Addr0"]["display_name"] == "Display0"
+            assert cache.get_many([]) == {}
+
+    def test_memory_lru_invalidated_on_writes(self):
+        """Test that hot entries served from memory never go stale after writes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            norm_addr = "123 Main St, Springfield, IL 62701, USA"
+
+            cache.put(norm_addr, 39.0, -89.0, "Old Display", source="nominatim")
+            assert cache.get(norm_addr)["display_name"] == "Old Display"
+            assert norm_addr in cache._mem
+
+            cache.put(norm_addr, 39.7817, -89.6501, "New Display", source="nominatim")
+            assert cache.get(norm_addr)["display_name"] == "New Display"
+
+            cache.clear_by_state("IL")
+            assert cache.get(norm_addr) is None
+
+    def test_memory_lru_skips_rows_read_before_a_write(self):
+        """Test that a lookup racing a write does not leave the old row in memory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            norm_addr = "123 Main St, Springfield, IL 62701, USA"
+            cache.put(norm_addr, 39.0, -89.0, "Old Display", source="nominatim")
+
+            reader = cache._reader
+
+            @contextlib.contextmanager
+            def racing_reader():
+                with reader() as conn:
+                    yield conn
+                # Another thread stores a new answer after the row was read
+                cache.put(norm_addr, 39.7817, -89.6501, "New Display", source="nominatim")
+
+            cache._reader = racing_reader
+            assert cache.get(norm_addr)["display_name"] == "Old Display"
+            cache._reader = reader
+
+            assert norm_addr not in cache._mem
+            assert cache.get(norm_addr)["display_name"] == "New Display"
+
     def test_normalize_address(self):
         """Test address normalization."""
         # Normal case
@@ -191,12 +286,11 @@ class TestGeocodingCache:
                 assert result["display_name"] == disp
 
     def test_thread_safety_simulation(self):
-        """Test that each operation opens its own connection."""
+        """Test interleaved puts and gets on the same cache instance."""
         with tempfile.TemporaryDirectory() as tmpdir:
             cache = GeocodingCache(cache_dir=Path(tmpdir))
 
             # Simulate multiple "threads" by performing operations sequentially
-            # Each operation should open and close its own connection
             cache.put("Addr1", 1.0, 1.0, "Display1", source="nominatim")
             result1 = cache.get("Addr1")
 
@@ -209,6 +303,81 @@ class TestGeocodingCache:
             assert result1["lat"] == 1.0
             assert result2["lat"] == 2.0
 
+    def test_schema_created_once(self, monkeypatch):
+        """Test that DDL runs on the first connect() only, and again after clear()."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            calls = []
+            original = cache._create_schema
+
+            def counting(cur):
+                calls.append(1)
+                original(cur)
+
+            monkeypatch.setattr(cache, "_create_schema", counting)
+
+            cache.connect().close()
+            cache.connect().close()
+            assert len(calls) == 1
+
+            cache.clear()
+            cache.put("Addr1", 1.0, 2.0, "Display1")
+            assert len(calls) == 2
+            assert cache.get("Addr1")["lat"] == 1.0
+            cache.close()
+
+    def test_reader_pool_is_read_only(self):
+        """Test that lookups use read-only connections and writes use the shared writer."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            cache.put("Addr1", 1.0, 2.0, "Display1")
+            writer = cache._get_writer()
+            assert cache._get_writer() is writer
+
+            with cache._reader() as reader:
+                assert reader is not writer
+                with pytest.raises(sqlite3.OperationalError):
+                    reader.execute("DELETE FROM addresses")
+
+            # Readers return to the pool and see the writer's commits
+            cache.put("Addr2", 3.0, 4.0, "Display2")
+            assert set(cache.get_many(["Addr1", "Addr2"])) == {"Addr1", "Addr2"}
+            assert len(cache._readers) == 1
+
+            # clear() drops every connection; the next call reconnects
+            cache.clear()
+            cache.put("Addr3", 5.0, 6.0, "Display3")
+            assert cache._get_writer() is not writer
+            assert cache.get("Addr3")["lat"] == 5.0
+            cache.close()
+
+    def test_close_retires_borrowed_readers(self):
+        """Test that close() never re-pools a borrowed reader and later lookups fail."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            cache.put("Addr1", 1.0, 2.0, "Display1")
+            assert cache.get("Addr1")["lat"] == 1.0
+
+            with cache._reader() as reader:
+                cache.close()
+                # Still usable by the thread that borrowed it
+                assert reader.execute("SELECT COUNT(*) FROM addresses").fetchone()[0] == 1
+            assert cache._reader_pool.empty()
+            with pytest.raises(sqlite3.ProgrammingError):
+                reader.execute("SELECT 1")
+
+            # Even addresses held in the memory LRU are no longer served
+            with pytest.raises(sqlite3.ProgrammingError):
+                cache.get("Addr1")
+            with pytest.raises(sqlite3.ProgrammingError):
+                cache.get_many(["Addr1"])
+            with pytest.raises(sqlite3.ProgrammingError):
+                cache.put("Addr2", 3.0, 4.0, "Display2")
+
     def test_clear_by_address(self):
         """Test clearing a specific cache entry by address."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -328,6 +497,90 @@ class TestGeocodingCache:
             deleted = cache.clear_by_state("il")
             assert deleted == 1
 
+    def test_state_code_of(self):
+        """Test extracting the state code from normalized addresses."""
+        assert GeocodingCache.state_code_of("123 Main St, Springfield, IL 62701, USA") == "IL"
+        assert GeocodingCache.state_code_of("1 Calle Sol, San Juan, pr 00901, USA") == "PR"
+        assert GeocodingCache.state_code_of("Addr1") is None
+
+    def test_state_code_of_without_zip(self):
+        """Test that rows with no zip still carry their state code."""
+        norm = GeocodingCache.normalize_address("123 Main St", "Springfield", "IL", "")
+        assert GeocodingCache.state_code_of(norm) == "IL"
+        bare = GeocodingCache.normalize_address("", "", "wi", "")
+        assert GeocodingCache.state_code_of(bare) == "WI"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            cache.put(norm, 39.78, -89.65, "Springfield, IL", source="nominatim")
+            assert cache.get_cache_stats("IL")["total"] == 1
+            assert cache.clear_by_state("IL") == 1
+
+    def test_connect_migrates_legacy_schema(self):
+        """Test that legacy caches are rebuilt with state_code and integer timestamps."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            legacy = sqlite3.connect(str(cache.get_cache_path()))
+            legacy.execute(
+                "CREATE TABLE addresses (id INTEGER PRIMARY KEY, normalized_address TEXT UNIQUE, "
+                "latitude REAL, longitude REAL, display_name TEXT, source TEXT, updated_at TEXT)"
+            )
+            legacy.execute(
+                "INSERT INTO addresses (normalized_address, latitude, longitude, display_name, "
+                "source, updated_at) VALUES (?, 1.0, 2.0, '', 'nominatim', datetime('now'))",
+                ("123 Main St, Springfield, IL 62701, USA",),
+            )
+            legacy.commit()
+            legacy.close()
+
+            stats = cache.get_cache_stats(state_code="IL")
+            assert stats["total"] == 1
+            assert stats["successful"] == 1
+
+            result = cache.get("123 Main St, Springfield, IL 62701, USA")
+            assert isinstance(result["updated_at"], int)
+            assert abs(result["updated_at"] - time.time()) < 3600
+            cache.close()
+
+    def test_connect_migrates_rowid_schema(self):
+        """Test that rowid caches are rebuilt keyed by address, keeping every entry."""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = GeocodingCache(cache_dir=Path(tmpdir))
+            old = sqlite3.connect(str(cache.get_cache_path()))
+            old.execute(
+                "CREATE TABLE addresses (id INTEGER PRIMARY KEY, normalized_address TEXT UNIQUE, "
+                "latitude REAL, longitude REAL, display_name TEXT, source TEXT, "
+                "updated_at INTEGER, state_code TEXT)"
+            )
+            old.execute("CREATE UNIQUE INDEX idx_addresses_norm ON addresses(normalized_address)")
+            old.executemany(
+                "INSERT INTO addresses (normalized_address, latitude, longitude, display_name, "
+                "source, updated_at, state_code) VALUES (?, ?, ?, ?, ?, 1700000000, ?)",
+                [
+                    ("1 Main St, Springfield, IL 62701, USA", 1.0, 2.0, "SP", "nominatim", "IL"),
+                    ("2 Main St, Madison, WI 53703, USA", None, None, "", "none", "WI"),
+                ],
+            )
+            old.commit()
+            old.close()
+
+            result = cache.get("1 Main St, Springfield, IL 62701, USA")
+            assert result["lat"] == 1.0
+            assert result["updated_at"] == 1700000000
+            assert cache.get_cache_stats()["total"] == 2
+            assert cache.clear_by_state("WI") == 1
+
+            conn = cache.connect()
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+            conn.close()
+            assert "idx_addresses_norm" not in names
+            assert "addresses_legacy" not in names
+            cache.close()
+
     def test_get_cache_stats_all(self):
         """Test getting cache statistics for all entries."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,83 @@
+"""Tests for rate-limited concurrent geocoding."""
+
+import threading
+import time
+
+import pytest
+
+from app.geocoding import GeocodingStrategy, RateLimitedGeocoder, TokenBucket
+
+
+class FakeStrategy(GeocodingStrategy):
+    """Strategy that echoes the query and records peak concurrency."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def geocode(self, query):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        return {"lat": 1.0, "lon": 2.0, "display_name": query}
+
+    def get_source_name(self):
+        return "fake"
+
+    def set_concurrency(self, workers):
+        self.workers = workers
+
+    def get_rate_limit_delay(self):
+        return self.delay
+
+
+def test_token_bucket_limits_rate():
+    """Test that takes beyond the burst wait for refill."""
+    bucket = TokenBucket(rate=50.0, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.take()
+    # First token is immediate, the remaining five need ~0.02s each
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_wait_can_be_cancelled():
+    """Test that a cancelled wait returns early without taking a token."""
+    bucket = TokenBucket(rate=0.5, capacity=1)
+    assert bucket.take() is True
+    stop = threading.Event()
+    threading.Timer(0.05, stop.set).start()
+    start = time.monotonic()
+    assert bucket.take(stop.is_set) is False
+    assert time.monotonic() - start < 1.0
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    """Test that a zero rate is rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_pool_size_follows_rate_limit():
+    """Test that slow providers get one worker and fast ones get several."""
+    with RateLimitedGeocoder(FakeStrategy(delay=1.05)) as slow:
+        assert slow.max_workers == 1
+        assert slow.strategy.workers == 1
+    with RateLimitedGeocoder(FakeStrategy(delay=0.02)) as fast:
+        assert fast.max_workers == 32
+        assert fast.strategy.workers == 32
+
+
+def test_map_preserves_order_and_runs_concurrently():
+    """Test that map() returns results in input order using several workers."""
+    strategy = FakeStrategy(delay=0.001)
+    queries = [f"Addr{i}" for i in range(20)]
+    with RateLimitedGeocoder(strategy, max_workers=4) as geocoder:
+        results = geocoder.map(queries)
+    assert [r["display_name"] for r in results] == queries
+    assert strategy.peak > 1
@@ -49,3 +49,122 @@ def test_strategy_interface_is_abstract():
     """Test that GeocodingStrategy cannot be instantiated directly."""
     with pytest.raises(TypeError):
         GeocodingStrategy()
+
+
+def test_nominatim_light_clean_and_zip_strip():
+    """Test that unit noise and ZIP codes are removed without touching the street."""
+    clean = NominatimStrategy._light_clean
+    assert clean("100 Main St, Suite 200, Springfield") == "100 Main St, Springfield"
+    assert clean("100 Main St   Ste. B , Springfield") == "100 Main St, Springfield"
+    assert clean("100 Main St #12, Springfield") == "100 Main St, Springfield"
+    assert clean("3500 SE Frank Phillips, 2nd floor") == "3500 SE Frank Phillips, 2nd floor"
+
+    strip = NominatimStrategy._strip_postal_code
+    assert strip("100 Main St, Springfield, IL 62701-1234") == "100 Main St, Springfield, IL"
+
+
+def test_nominatim_attempts_are_lazy_and_deduplicated(monkeypatch):
+    """Test that duplicate variants are skipped and later variants are not built on success."""
+    strategy = NominatimStrategy(email="test@example.com")
+    sent = []
+
+    def fake_attempt(query):
+        sent.append(query)
+
+    monkeypatch.setattr(strategy, "_single_geocode_attempt", fake_attempt)
+    strategy.geocode("100 Main St, Springfield, IL 62701")
+    # Cleaning is a no-op here, so only the original and the ZIP-less query are sent
+    assert sent == ["100 Main St, Springfield, IL 62701", "100 Main St, Springfield, IL"]
+
+    def fail_strip(address):
+        raise AssertionError("ZIP relaxation should not run after a first-attempt hit")
+
+    monkeypatch.setattr(strategy, "_single_geocode_attempt", lambda q: {"lat": 1.0})
+    monkeypatch.setattr(strategy, "_strip_postal_code", fail_strip)
+    assert strategy.geocode("100 Main St, Springfield, IL 62701") == {"lat": 1.0}
+
+
+def test_nominatim_select_best_result_tiers():
+    """Test that street addresses beat road-only hits, which beat bare US centroids."""
+    strategy = NominatimStrategy(email="test@example.com")
+
+    def item(name, lat="1", country="us", **addr):
+        address = {"country_code": country, **addr}
+        return {"lat": lat, "lon": "2", "display_name": name, "address": address}
+
+    centroid = item("centroid")
+    road = item("road", road="Main St")
+    street = item("street", road="Main St", house_number="100")
+    foreign = item("foreign", country="ca", road="Main St", house_number="1")
+
+    pick = strategy._select_best_result
+    assert pick([centroid, road, street])["display_name"] == "street"
+    assert pick([foreign, centroid, road, item("road2", highway="I-55")])["display_name"] == "road"
+    expected = {"lat": 1.0, "lon": 2.0, "display_name": "centroid"}
+    assert pick([item("nolat", lat=""), centroid]) == expected
+    assert pick([foreign]) is None
+
+
+def test_nominatim_parses_response_body(monkeypatch):
+    """Test that a 200 body is decoded (orjson or stdlib) and a bad body is logged."""
+    pytest.importorskip("requests")
+    import json
+
+    body = [{"lat": "1", "lon": "2", "display_name": "hit", "address": {"country_code": "us"}}]
+
+    class FakeResponse:
+        status_code = 200
+
+        def __init__(self, content):
+            self.content = content
+
+        def json(self):
+            return json.loads(self.content)
+
+    class FakeSession:
+        content = json.dumps(body).encode()
+
+        def get(self, url, params, timeout):
+            return FakeResponse(self.content)
+
+    messages = []
+    strategy = NominatimStrategy(email="test@example.com", logger=messages.append)
+    session = FakeSession()
+    monkeypatch.setattr(strategy, "_get_session", lambda: session)
+    assert strategy._single_geocode_attempt("q") == {"lat": 1.0, "lon": 2.0, "display_name": "hit"}
+
+    session.content = b"<html>"
+    assert strategy._single_geocode_attempt("q") is None
+    assert messages and "parse error" in messages[-1]
+
+
+def test_nominatim_session_retries_throttled_requests():
+    """Test that the shared session retries 429/5xx on its keep-alive adapter."""
+    pytest.importorskip("requests")
+    strategy = NominatimStrategy(email="test@example.com")
+    try:
+        adapter = strategy._get_session().get_adapter(strategy.base_url)
+        assert adapter.max_retries.total == 3
+        assert 429 in adapter.max_retries.status_forcelist
+        assert strategy._get_session() is strategy._get_session()
+        assert adapter._pool_maxsize == 1
+
+        # The runner sizes the keep-alive pool to its worker count
+        strategy.set_concurrency(4)
+        adapter = strategy._get_session().get_adapter(strategy.base_url)
+        assert adapter._pool_maxsize == 4
+    finally:
+        strategy.close()
+
+
+def test_nominatim_self_hosted_server_settings():
+    """Test that a self-hosted server gets its own endpoint and request interval."""
+    public = NominatimStrategy(email="test@example.com")
+    assert public.base_url == "https://nominatim.openstreetmap.org/search"
+    assert public.get_rate_limit_delay() >= 1.05
+
+    local = NominatimStrategy(
+        email="test@example.com", base_url="http://localhost:8080/search", min_interval=0.1
+    )
+    assert local.base_url == "http://localhost:8080/search"
+    assert local.get_rate_limit_delay() == 0.1